@@ -0,0 +1,202 @@
+"""Async (ASGI) variant of the Number Classification API.
+
+Serves the same routes and responses as classify_number.py, but fetches fun
+facts through a shared httpx.AsyncClient and runs CPU-heavy classification in
+a process pool, so one slow upstream call or one huge number never blocks
+other requests. Run it with:
+
+    uvicorn --app-dir api asgi:app --host 0.0.0.0 --port 80
+"""
+import asyncio
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+
+from starlette.applications import Starlette
+from starlette.concurrency import iterate_in_threadpool
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+
+from async_upstream import AsyncFactCache, AsyncNumbersApiClient
+from batch import classify_batch
+from config import (
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_RESET_TIMEOUT,
+    CPU_BATCH_SIZE,
+    CPU_HEAVY_THRESHOLD,
+    CPU_INLINE_FACTOR_WORK,
+    CPU_WORKERS,
+    FACT_CACHE_SIZE,
+    FACT_CACHE_STALE_TTL,
+    FACT_CACHE_TTL,
+    FACT_FETCHES_PER_REQUEST,
+    FACT_LATENCY_BUDGET,
+    FACT_MAX_PENDING,
+    FACT_SNAPSHOT_PATH,
+    NUMBERS_API_URL,
+    UPSTREAM_POOL_SIZE,
+    UPSTREAM_TIMEOUT,
+)
+from fact_cache import FactCache
+import metrics
+from params import InvalidRequest, batch_request, range_request, single_request
+from pipeline import NO_FUN_FACT, classify, factoring_work
+from stream import chunked, classify_range, ndjson
+from upstream import CircuitBreaker
+
+numbers_api = None
+fact_cache = None
+cpu_pool = None
+
+# Process-pool workers. They never touch the network: numbers whose fun fact
+# still has to be fetched come back alongside the results, with the
+# placeholder NO_FUN_FACT in their fun_fact field.
+
+def classify_deferring_fact(n, fields):
+    deferred = []
+    result = classify(n, fields, fetch_fact=lambda m: deferred.append(m) or NO_FUN_FACT)
+    return result, deferred
+
+def classify_batch_deferring_facts(numbers, fields):
+    deferred = []
+
+    def defer(wanted):
+        deferred.extend(wanted)
+        return dict.fromkeys(wanted, NO_FUN_FACT)
+
+    return classify_batch(numbers, fields, fact_lookup=defer), deferred
+
+async def fill_facts(results, deferred):
+    if not deferred:
+        return
+    facts = await fact_cache.get_many(deferred, timeout=FACT_LATENCY_BUDGET, max_fetches=FACT_FETCHES_PER_REQUEST)
+    for result in results:
+        fact = facts.get(result["number"])
+        if fact is not None:
+            result["fun_fact"] = fact
+
+def needs_process_pool(numbers, fields):
+    # True when classifying `numbers` could hold the event loop for more
+    # than a few milliseconds.
+    return (len(numbers) >= CPU_BATCH_SIZE
+            or any(abs(n) >= CPU_HEAVY_THRESHOLD for n in numbers)
+            or factoring_work(numbers, fields) > CPU_INLINE_FACTOR_WORK)
+
+def cached_fun_facts(numbers):
+    # Cache-only lookup for range streams; they never start upstream fetches.
+    facts = fact_cache.cache.lookup_many(numbers)
+    return {n: fact or NO_FUN_FACT for n, fact in facts.items()}
+
+async def run_cpu(func, *args):
+    return await asyncio.get_running_loop().run_in_executor(cpu_pool, func, *args)
+
+async def invalid_request(request, exc):
+    return JSONResponse(exc.payload, status_code=400)
+
+async def index(request):
+    return PlainTextResponse(
+        "Welcome to the Number Classification API! Use /api/classify-number?number=YOUR_NUMBER to classify a number.")
+
+async def classify_number(request):
+    timer = metrics.RequestTimer("classify_number")
+    with timer.finish_on_error(), timer.stage("parse"):
+        n, fields = single_request(request.query_params)
+
+    if needs_process_pool([n], fields):
+        with timer.stage("process_pool"):
+            result, deferred = await run_cpu(classify_deferring_fact, n, fields)
+    else:
+        with timer.active():
+            result, deferred = classify_deferring_fact(n, fields)
+    with timer.stage("fun_fact"):
+        await fill_facts([result], deferred)
+
+    with timer.stage("serialize"):
+        response = JSONResponse(result)
+
+    return metrics.timed(response, timer)
+
+async def classify_numbers(request):
+    try:
+        payload = await request.json()
+    except ValueError:
+        payload = None
+    timer = metrics.RequestTimer("classify_numbers")
+    with timer.finish_on_error(), timer.stage("parse"):
+        numbers, fields = batch_request(request.query_params, payload)
+
+    with timer.stage("classify_batch"):
+        if needs_process_pool(numbers, fields):
+            results, deferred = await run_cpu(classify_batch_deferring_facts, numbers, fields)
+        else:
+            results, deferred = classify_batch_deferring_facts(numbers, fields)
+    with timer.stage("fun_fact"):
+        await fill_facts(results, deferred)
+
+    with timer.stage("serialize"):
+        response = JSONResponse({"count": len(results), "results": results})
+
+    return metrics.timed(response, timer)
+
+async def classify_range_stream(request):
+    first, stop, next_cursor, fields = range_request(request.query_params)
+
+    async def lines():
+        # The generator runs in a worker thread one chunk at a time.
+        results = chunked(classify_range(first, stop, fields, fact_lookup=cached_fun_facts))
+        async for chunk in iterate_in_threadpool(results):
+            yield ndjson(chunk)
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson", headers={
+        # Cursor for the next page, or empty once the range is exhausted.
+        "X-Next-Cursor": next_cursor,
+        # Ask reverse proxies not to buffer, so chunks flow as they are produced.
+        "X-Accel-Buffering": "no",
+    })
+
+async def stats(request):
+    return JSONResponse({
+        "fact_cache": fact_cache.stats(),
+        "upstream": numbers_api.stats(),
+        "cpu_pool": {"workers": CPU_WORKERS},
+    })
+
+async def prometheus_metrics(request):
+    return PlainTextResponse(metrics.render(fact_cache.stats()), media_type="text/plain; version=0.0.4")
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    global numbers_api, fact_cache, cpu_pool
+    numbers_api = AsyncNumbersApiClient(
+        NUMBERS_API_URL,
+        timeout=UPSTREAM_TIMEOUT,
+        pool_size=UPSTREAM_POOL_SIZE,
+        breaker=CircuitBreaker(BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_TIMEOUT),
+    )
+    # FactCache only stores entries here; AsyncFactCache does the fetching.
+    store = FactCache(None, maxsize=FACT_CACHE_SIZE, ttl=FACT_CACHE_TTL, stale_ttl=FACT_CACHE_STALE_TTL)
+    store.seed_from_file(FACT_SNAPSHOT_PATH)
+    # One concurrent fetch per pooled connection, so none waits on the pool.
+    fact_cache = AsyncFactCache(store, numbers_api.fetch_fact,
+                                concurrency=UPSTREAM_POOL_SIZE, max_pending=FACT_MAX_PENDING)
+    cpu_pool = ProcessPoolExecutor(max_workers=CPU_WORKERS)
+    try:
+        yield
+    finally:
+        cpu_pool.shutdown(cancel_futures=True)
+        await numbers_api.aclose()
+
+app = Starlette(
+    routes=[
+        Route('/', index, methods=['GET']),
+        Route('/api/classify-number', classify_number, methods=['GET']),
+        Route('/api/classify-numbers', classify_numbers, methods=['POST']),
+        Route('/api/classify-range', classify_range_stream, methods=['GET']),
+        Route('/api/stats', stats, methods=['GET']),
+        Route('/metrics', prometheus_metrics, methods=['GET']),
+    ],
+    middleware=[Middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["*"], allow_headers=["*"])],
+    exception_handlers={InvalidRequest: invalid_request},
+    lifespan=lifespan,
+)
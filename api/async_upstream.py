@@ -0,0 +1,148 @@
+import asyncio
+
+import httpx
+
+from upstream import CircuitBreaker
+
+class AsyncNumbersApiClient:
+    # asyncio counterpart of upstream.NumbersApiClient: one shared
+    # httpx.AsyncClient connection pool behind the same CircuitBreaker.
+
+    def __init__(self, base_url, timeout=3, pool_size=8, breaker=None):
+        self.base_url = base_url.rstrip("/")
+        self.pool_size = pool_size
+        self.breaker = breaker or CircuitBreaker()
+        self.client = httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+        )
+        self._counters = dict.fromkeys(("requests", "failures", "short_circuited", "pool_timeouts"), 0)
+
+    async def fetch_fact(self, n):
+        # Returns the fact text, or None so that failures are not cached.
+        if not self.breaker.allow():
+            self._counters["short_circuited"] += 1
+            return None
+        self._counters["requests"] += 1
+        try:
+            fact_response = await self.client.get(f"{self.base_url}/{n}/math?json")
+            if fact_response.status_code >= 500:
+                raise httpx.HTTPStatusError(
+                    f"Numbers API returned {fact_response.status_code}",
+                    request=fact_response.request, response=fact_response)
+            text = fact_response.json().get("text") if fact_response.status_code == 200 else None
+        except httpx.PoolTimeout:
+            # No connection came free locally; the upstream was never asked,
+            # so this says nothing about its health.
+            self._counters["pool_timeouts"] += 1
+            self.breaker.release()
+            return None
+        except (httpx.HTTPError, ValueError, AttributeError):
+            self._counters["failures"] += 1
+            self.breaker.record_failure()
+            return None
+        self.breaker.record_success()
+        return text
+
+    def stats(self):
+        stats = dict(self._counters)
+        stats["breaker"] = self.breaker.stats()
+        stats["pool"] = {"maxsize": self.pool_size}
+        return stats
+
+    async def aclose(self):
+        await self.client.aclose()
+
+class AsyncFactCache:
+    # asyncio front end to a fact_cache.FactCache: shares its entries, TTLs
+    # and counters, but coalesces concurrent misses onto one asyncio task
+    # instead of a worker thread, so no thread blocks on the upstream. At
+    # most `concurrency` fetches run at once and at most `max_pending` are
+    # queued or running; misses beyond that get None without a fetch.
+
+    def __init__(self, cache, fetch, concurrency=8, max_pending=None):
+        self.cache = cache
+        self.fetch = fetch
+        self.max_pending = max_pending or cache.max_pending
+        self._slots = asyncio.Semaphore(concurrency)
+        self._inflight = {}
+
+    async def get(self, key, timeout=None):
+        # Returns the fact, or None if the fetch failed or overran `timeout`;
+        # an overrunning fetch keeps going and fills the cache when it lands.
+        value, task, started = self._lookup(key)
+        if task is None:
+            return value
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), timeout)
+        except asyncio.TimeoutError:
+            self.cache.count("timeouts")
+            return None
+
+    async def get_many(self, keys, timeout=None, max_fetches=None):
+        # Like get() for several keys at once: misses are fetched concurrently
+        # under one shared `timeout`, and only the first `max_fetches` of
+        # them start a fetch. Returns {key: fact or None}.
+        facts = {}
+        tasks = {}
+        fetches = 0
+        for key in dict.fromkeys(keys):
+            facts[key], task, started = self._lookup(key, max_fetches is None or fetches < max_fetches)
+            fetches += started
+            if task is not None:
+                tasks[key] = task
+        if tasks:
+            # asyncio.wait leaves unfinished fetches running to fill the cache.
+            await asyncio.wait(tasks.values(), timeout=timeout)
+        for key, task in tasks.items():
+            if task.done():
+                facts[key] = task.result()
+            else:
+                self.cache.count("timeouts")
+        return facts
+
+    def stats(self):
+        stats = self.cache.stats()
+        stats["inflight"] = len(self._inflight)
+        stats["max_pending"] = self.max_pending
+        return stats
+
+    def _lookup(self, key, may_fetch=True):
+        # Returns (cached value, in-flight task or None, whether a new fetch
+        # was started), mirroring FactCache._lookup.
+        value, state = self.cache.lookup(key)
+        may_fetch = may_fetch and len(self._inflight) < self.max_pending
+        if state != "miss":
+            started = state == "stale" and key not in self._inflight and may_fetch
+            if started:
+                self.cache.count("refreshes")
+                self._start_fetch(key)
+            return value, None, started
+        task = self._inflight.get(key)
+        if task is not None:
+            self.cache.count("coalesced")
+            return None, task, False
+        if not may_fetch:
+            self.cache.count("rejected")
+            return None, None, False
+        self.cache.count("misses")
+        return None, self._start_fetch(key), True
+
+    def _start_fetch(self, key):
+        task = asyncio.ensure_future(self._run_fetch(key))
+        self._inflight[key] = task
+        return task
+
+    async def _run_fetch(self, key):
+        try:
+            async with self._slots:
+                value = await self.fetch(key)
+        except Exception:
+            value = None
+        finally:
+            self._inflight.pop(key, None)
+        if value is None:
+            self.cache.count("errors")
+        else:
+            self.cache.put(key, value)
+        return value
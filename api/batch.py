@@ -0,0 +1,188 @@
+import math
+
+import numpy as np
+
+from pipeline import NO_FUN_FACT, classify
+import primality
+from primality import SIEVE_LIMIT, is_prime
+
+# Batches whose largest value is below this get their own NumPy sieve;
+# larger values fall back to the scalar primality engine.
+BATCH_SIEVE_LIMIT = 10 ** 7
+
+# Kernels work on int64, so anything at or beyond this is classified scalar.
+INT64_LIMIT = 1 << 63
+
+# Every even perfect number that fits in an int64 (Mersenne exponents up to 31).
+PERFECT_INT64 = np.array([(1 << (p - 1)) * ((1 << p) - 1) for p in (2, 3, 5, 7, 13, 17, 19, 31)],
+                         dtype=np.int64)
+
+# Fields the kernels below fill in for a whole batch at once.
+VECTORIZED_FIELDS = ("is_prime", "is_perfect", "is_armstrong", "parity", "digit_sum")
+
+# Odd-only sieve shared by every batch above SIEVE_LIMIT; grown on demand.
+_batch_sieve = None
+
+def sieve_array(limit):
+    is_p = np.ones(limit + 1, dtype=bool)
+    is_p[:2] = False
+    is_p[4::2] = False
+    for p in range(3, math.isqrt(limit) + 1, 2):
+        if is_p[p]:
+            is_p[p * p::2 * p] = False
+    return is_p
+
+def odd_sieve_array(limit):
+    # Odd-only sieve in primality.build_sieve's layout: index i is 2*i + 1.
+    size = limit // 2 + 1
+    table = np.ones(size, dtype=bool)
+    table[0] = False
+    for i in range(1, (math.isqrt(limit) - 1) // 2 + 1):
+        if table[i]:
+            p = 2 * i + 1
+            table[p * p // 2::p] = False
+    return table
+
+def odd_sieve(limit):
+    # An odd-only table covering [0, limit], kept between requests. Up to
+    # SIEVE_LIMIT it is primality's own table, viewed without copying;
+    # beyond that one table is built, doubling in size as larger batches
+    # arrive, up to BATCH_SIEVE_LIMIT.
+    global _batch_sieve
+    if limit <= SIEVE_LIMIT:
+        return np.frombuffer(primality._get_sieve(), dtype=np.bool_)
+    if _batch_sieve is None or 2 * len(_batch_sieve) - 1 < limit:
+        size = max(limit, 2 * SIEVE_LIMIT) if _batch_sieve is None else max(limit, 4 * len(_batch_sieve))
+        _batch_sieve = odd_sieve_array(min(size, BATCH_SIEVE_LIMIT))
+    return _batch_sieve
+
+def sieve_lookup(table, values):
+    # Primality of non-negative `values` covered by the odd-only `table`.
+    return (values == 2) | ((values % 2 == 1) & table[values // 2])
+
+def parity_kernel(values):
+    return np.where(values % 2 == 0, "even", "odd")
+
+def digit_kernel(values):
+    # Returns (digit_sum, digit_count) arrays for |values|.
+    remaining = np.abs(values)
+    digit_sum = np.zeros_like(remaining)
+    digit_count = np.ones_like(remaining)
+    digit_sum += remaining % 10
+    remaining //= 10
+    while remaining.any():
+        nonzero = remaining > 0
+        digit_sum += remaining % 10
+        digit_count += nonzero
+        remaining //= 10
+    return digit_sum, digit_count
+
+def armstrong_kernel(values, digit_count):
+    # Sums digit ** digit_count in wrapping uint64 arithmetic; a 19-digit sum
+    # can overflow, so matches are re-checked exactly in Python.
+    magnitude = np.abs(values)
+    remaining = magnitude.astype(np.uint64)
+    power = digit_count.astype(np.uint64)
+    total = np.zeros_like(remaining)
+    while remaining.any():
+        total += np.power(remaining % np.uint64(10), power)
+        remaining //= np.uint64(10)
+    candidates = total == magnitude.astype(np.uint64)
+    for i in np.flatnonzero(candidates & (digit_count >= 19)):
+        digits = str(int(magnitude[i]))
+        candidates[i] = sum(int(d) ** len(digits) for d in digits) == int(magnitude[i])
+    return candidates
+
+def perfect_kernel(values):
+    return np.isin(values, PERFECT_INT64)
+
+def prime_kernel(values):
+    is_p = np.zeros(values.shape, dtype=bool)
+    positive = values >= 2
+    if not positive.any():
+        return is_p
+    top = int(values.max())
+    if top <= BATCH_SIEVE_LIMIT:
+        is_p[positive] = sieve_lookup(odd_sieve(top), values[positive])
+        return is_p
+    small = positive & (values <= SIEVE_LIMIT)
+    if small.any():
+        is_p[small] = sieve_lookup(odd_sieve(SIEVE_LIMIT), values[small])
+    # No vectorized modular exponentiation over int64 without overflow, so
+    # large values go through Miller-Rabin one at a time.
+    for i in np.flatnonzero(positive & ~small):
+        is_p[i] = is_prime(int(values[i]))
+    return is_p
+
+def segmented_sieve(start, end, segment_size):
+    # Yields (values, is_prime) array pairs covering [start, end] in order,
+    # at most `segment_size` numbers at a time, so memory does not grow with
+    # the size of the range.
+    base_primes = np.flatnonzero(sieve_array(math.isqrt(max(end, 0)))).tolist()
+    low = start
+    while low <= end:
+        high = min(low + segment_size - 1, end)
+        values = np.arange(low, high + 1, dtype=np.int64)
+        is_p = np.zeros(len(values), dtype=bool)
+        first_candidate = max(low, 2)
+        if first_candidate <= high:
+            segment = is_p[first_candidate - low:]
+            segment[:] = True
+            for p in base_primes:
+                if p * p > high:
+                    break
+                first = max(p * p, -(-first_candidate // p) * p)
+                segment[first - first_candidate::p] = False
+        yield values, is_p
+        low = high + 1
+
+def vectorized_columns(values, fields, prime_flags=None):
+    # Computes the requested VECTORIZED_FIELDS (plus what they depend on)
+    # for an int64 array; returns {field: python list}. `prime_flags` can
+    # supply is_prime when the caller has already sieved these values.
+    needed = set(fields)
+    if needed & {"properties", "fun_fact"}:
+        needed.update(("is_prime", "is_perfect", "is_armstrong", "parity"))
+    columns = {}
+    if "parity" in needed:
+        columns["parity"] = parity_kernel(values).tolist()
+    if needed & {"digit_sum", "is_armstrong"}:
+        digit_sum, digit_count = digit_kernel(values)
+        if "digit_sum" in needed:
+            columns["digit_sum"] = digit_sum.tolist()
+        if "is_armstrong" in needed:
+            columns["is_armstrong"] = armstrong_kernel(values, digit_count).tolist()
+    if "is_perfect" in needed:
+        columns["is_perfect"] = perfect_kernel(values).tolist()
+    if "is_prime" in needed:
+        if prime_flags is None:
+            prime_flags = prime_kernel(values)
+        columns["is_prime"] = prime_flags.tolist()
+    return columns
+
+def classify_batch(numbers, fields, fact_lookup=None):
+    # Classifies a list of ints, returning one classify()-shaped dict per
+    # item in input order. `fact_lookup` maps a list of numbers to
+    # {number: fact}; it is called once with the distinct numbers that need
+    # a fact fetched.
+    in_range = [i for i, n in enumerate(numbers) if -INT64_LIMIT < n < INT64_LIMIT]
+    per_item = [None] * len(numbers)
+    if in_range:
+        values = np.array([numbers[i] for i in in_range], dtype=np.int64)
+        columns = vectorized_columns(values, fields)
+        for row, i in enumerate(in_range):
+            per_item[i] = {name: column[row] for name, column in columns.items()}
+    return classify_rows(numbers, per_item, fields, fact_lookup)
+
+def classify_rows(numbers, per_item, fields, fact_lookup=None):
+    # Finishes classification from precomputed per-item values (None where
+    # nothing was precomputed), fetching facts once per distinct number.
+    fetch_fact = None
+    if "fun_fact" in fields and fact_lookup is not None:
+        wanted = [n for n, values in zip(numbers, per_item)
+                  if values is None or not values["is_armstrong"]]
+        facts = fact_lookup(list(dict.fromkeys(wanted)))
+        fetch_fact = lambda n: facts.get(n) or NO_FUN_FACT
+
+    return [classify(n, fields, fetch_fact=fetch_fact, values=values)
+            for n, values in zip(numbers, per_item)]
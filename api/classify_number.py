@@ -1,57 +1,69 @@
-import os
-import math
-import requests
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
-
-# Load configuration from environment variables
-NUMBERS_API_URL = os.getenv("NUMBERS_API_URL", "http://numbersapi.com")
-HOST = os.getenv("FLASK_HOST", "0.0.0.0")
-PORT = int(os.getenv("FLASK_PORT", 80))
+from config import (
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_RESET_TIMEOUT,
+    FACT_CACHE_SIZE,
+    FACT_CACHE_STALE_TTL,
+    FACT_CACHE_TTL,
+    FACT_FETCHES_PER_REQUEST,
+    FACT_LATENCY_BUDGET,
+    FACT_MAX_PENDING,
+    FACT_SNAPSHOT_PATH,
+    HOST,
+    NUMBERS_API_URL,
+    PORT,
+    UPSTREAM_POOL_SIZE,
+    UPSTREAM_TIMEOUT,
+)
+from fact_cache import FactCache
+import metrics
+from params import InvalidRequest, batch_request, range_request, single_request
+from pipeline import NO_FUN_FACT, classify
+from upstream import CircuitBreaker, NumbersApiClient
 
 app = Flask(__name__)
 CORS(app)
 
-def is_prime(n):
-    if n < 2:
-        return False
-    for i in range(2, int(math.sqrt(n)) + 1):
-        if n % i == 0:
-            return False
-    return True
-
-def is_perfect(n):
-    if n <= 0:
-        return False
-    if n == 1:
-        return False
-    sum_divisors = 1
-    for i in range(2, int(math.sqrt(n)) + 1):
-        if n % i == 0:
-            sum_divisors += i
-            if i != n // i:
-                sum_divisors += n // i
-    return sum_divisors == n
-
-def is_armstrong(n):
-    # Use absolute value for Armstrong check so negative numbers work
-    digits = str(abs(n))
-    power = len(digits)
-    return sum(int(digit) ** power for digit in digits) == abs(n)
-
-def sum_of_digits(n):
-    return sum(int(digit) for digit in str(abs(n)))
+numbers_api = NumbersApiClient(
+    NUMBERS_API_URL,
+    timeout=UPSTREAM_TIMEOUT,
+    pool_size=UPSTREAM_POOL_SIZE,
+    breaker=CircuitBreaker(BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_TIMEOUT),
+)
+
+# One cache worker per pooled connection.
+fact_cache = FactCache(
+    numbers_api.fetch_fact,
+    maxsize=FACT_CACHE_SIZE,
+    ttl=FACT_CACHE_TTL,
+    stale_ttl=FACT_CACHE_STALE_TTL,
+    workers=UPSTREAM_POOL_SIZE,
+    max_pending=FACT_MAX_PENDING,
+)
+
+# Warm the cache from the snapshot bundled by scripts/build_index.py, if any.
+fact_cache.seed_from_file(FACT_SNAPSHOT_PATH)
 
 def get_fun_fact(n):
-    try:
-        url = f"{NUMBERS_API_URL}/{n}/math?json"
-        fact_response = requests.get(url, timeout=3)
-        if fact_response.status_code == 200:
-            fact_data = fact_response.json()
-            return fact_data.get("text", "No fun fact available.")
-    except (requests.RequestException, ValueError, KeyError):
-        return "No fun fact available."
-    return "No fun fact available."
+    return fact_cache.get(n, timeout=FACT_LATENCY_BUDGET) or NO_FUN_FACT
+
+def get_fun_facts(numbers):
+    # Fetches up to FACT_FETCHES_PER_REQUEST misses concurrently within a
+    # single latency budget.
+    facts = fact_cache.get_many(numbers, timeout=FACT_LATENCY_BUDGET, max_fetches=FACT_FETCHES_PER_REQUEST)
+    return {n: fact or NO_FUN_FACT for n, fact in facts.items()}
+
+def get_cached_fun_facts(numbers):
+    # Cache-only lookup for range streams: a stream may cover millions of
+    # numbers, so it never starts upstream fetches.
+    facts = fact_cache.lookup_many(numbers)
+    return {n: fact or NO_FUN_FACT for n, fact in facts.items()}
+
+# Invalid input is reported as a 400 with the payload built by params.py.
+@app.errorhandler(InvalidRequest)
+def invalid_request(exc):
+    return jsonify(exc.payload), 400
 
 # Define a root route for a welcome message.
 @app.route('/', methods=['GET'])
@@ -61,62 +73,71 @@ def index():
 # The main API route to classify our number.
 @app.route('/api/classify-number', methods=['GET'])
 def classify_number():
-    num_param = request.args.get('number')
-    
-    # Check for missing or empty input.
-    if not num_param or num_param.strip() == "":
-        return jsonify({
-            "number": "missing",
-            "error": True,
-            "message": "Number parameter is required"
-        }), 400
-
-    # Strip any surrounding whitespace.
-    num_param = num_param.strip()
-
-    try:
-        # Convert input to float to accept integers, negatives, and floats.
-        n_val = float(num_param)
-    except ValueError:
-        return jsonify({
-            "number": num_param,
-            "error": True,
-            "message": "Invalid number format"
-        }), 400
-
-    # For classification, convert to an integer.
-    # This means a valid float will be truncated (e.g., 3.14 becomes 3).
-    n = int(n_val)
-
-    # Initialize properties list.
-    properties = []
-    if is_prime(n):
-        properties.append("prime")
-    if is_perfect(n):
-        properties.append("perfect")
-    if is_armstrong(n):
-        properties.append("armstrong")
-    properties.append("even" if n % 2 == 0 else "odd")
-
-    # Determine the fun fact.
-    if is_armstrong(n):
-        digits = str(abs(n))
-        power = len(digits)
-        fun_fact = f"{n} is an Armstrong number because " + " + ".join(f"{d}^{power}" for d in digits) + f" = {n}"
-    else:
-        fun_fact = get_fun_fact(n)
-
-    # Create the response object.
-    response = {
-        "number": n,
-        "is_prime": is_prime(n),
-        "is_perfect": is_perfect(n),
-        "properties": properties,
-        "digit_sum": sum_of_digits(n),
-        "fun_fact": fun_fact
-    }
-
-    return jsonify(response), 200
+    timer = metrics.RequestTimer("classify_number")
+    with timer.finish_on_error(), timer.stage("parse"):
+        n, fields = single_request(request.args)
+
+    # Every field is computed at most once, and only if it was requested.
+    # Each one is timed as its own stage.
+    with timer.active():
+        response = classify(n, fields, fetch_fact=get_fun_fact)
+
+    with timer.stage("serialize"):
+        response = jsonify(response)
+
+    return metrics.timed(response, timer), 200
+
+# Classify many numbers in one request.
+@app.route('/api/classify-numbers', methods=['POST'])
+def classify_numbers():
+    timer = metrics.RequestTimer("classify_numbers")
+    with timer.finish_on_error(), timer.stage("parse"):
+        numbers, fields = batch_request(request.args, request.get_json(silent=True))
+
+    # Imported here so NumPy stays off the single-number cold-start path.
+    from batch import classify_batch
+
+    # Fact fetching is its own stage, as in the ASGI app.
+    def timed_fact_lookup(wanted):
+        with timer.stage("fun_fact"):
+            return get_fun_facts(wanted)
+
+    with timer.stage("classify_batch"):
+        results = classify_batch(numbers, fields, fact_lookup=timed_fact_lookup)
+
+    with timer.stage("serialize"):
+        response = jsonify({"count": len(results), "results": results})
+
+    return metrics.timed(response, timer), 200
+
+# Stream a range of classifications as newline-delimited JSON.
+@app.route('/api/classify-range', methods=['GET'])
+def classify_range_stream():
+    first, stop, next_cursor, fields = range_request(request.args)
+
+    # Imported here so NumPy stays off the single-number cold-start path.
+    from stream import classify_range, ndjson_chunks
+
+    results = classify_range(first, stop, fields, fact_lookup=get_cached_fun_facts)
+    response = Response(ndjson_chunks(results), mimetype="application/x-ndjson")
+    # Cursor for the next page, or empty once the range is exhausted.
+    response.headers["X-Next-Cursor"] = next_cursor
+    # Ask reverse proxies not to buffer, so chunks flow as they are produced.
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
+
+# Runtime counters for the service's caches.
+@app.route('/api/stats', methods=['GET'])
+def stats():
+    return jsonify({
+        "fact_cache": fact_cache.stats(),
+        "upstream": numbers_api.stats()
+    }), 200
+
+# Stage timing histograms and cache counters in Prometheus text format.
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    return Response(metrics.render(fact_cache.stats()), mimetype="text/plain; version=0.0.4")
 
 if __name__ == '__main__':
     app.run(host=HOST, port=PORT, debug=True)
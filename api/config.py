@@ -0,0 +1,44 @@
+import os
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+# Load configuration from environment variables
+NUMBERS_API_URL = os.getenv("NUMBERS_API_URL", "http://numbersapi.com")
+HOST = os.getenv("FLASK_HOST", "0.0.0.0")
+PORT = int(os.getenv("FLASK_PORT", 80))
+FACT_CACHE_SIZE = int(os.getenv("FACT_CACHE_SIZE", 1024))
+FACT_CACHE_TTL = float(os.getenv("FACT_CACHE_TTL", 3600))
+FACT_CACHE_STALE_TTL = float(os.getenv("FACT_CACHE_STALE_TTL", 86400))
+# Longest a request waits for an uncached fact before answering without it.
+FACT_LATENCY_BUDGET = float(os.getenv("FACT_LATENCY_BUDGET", 0.5))
+UPSTREAM_TIMEOUT = float(os.getenv("UPSTREAM_TIMEOUT", 3))
+UPSTREAM_POOL_SIZE = int(os.getenv("UPSTREAM_POOL_SIZE", 8))
+# Most fact fetches one request may start, and most fetches queued or running
+# at once; numbers beyond either limit get no fun fact rather than a fetch.
+FACT_FETCHES_PER_REQUEST = int(os.getenv("FACT_FETCHES_PER_REQUEST", UPSTREAM_POOL_SIZE))
+FACT_MAX_PENDING = int(os.getenv("FACT_MAX_PENDING", 4 * UPSTREAM_POOL_SIZE))
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", 5))
+BREAKER_RESET_TIMEOUT = float(os.getenv("BREAKER_RESET_TIMEOUT", 30))
+MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", 10000))
+# Largest |value| the batch endpoint accepts; beyond 64 bits every item needs
+# a Baillie-PSW test instead of a sieve lookup or Miller-Rabin.
+MAX_BATCH_VALUE = int(float(os.getenv("MAX_BATCH_VALUE", 2 ** 64)))
+# Largest |value| the streaming endpoint accepts; its sieve needs primes up to sqrt(end).
+MAX_STREAM_VALUE = int(os.getenv("MAX_STREAM_VALUE", 10 ** 12))
+# Largest estimated factorization work (about n^(1/4) per number) one request
+# may ask for with prime_factors, divisor_count or divisor_sum; the default
+# allows one 80-bit number, or e.g. 10000 numbers below 10^8.
+MAX_FACTOR_WORK = int(float(os.getenv("MAX_FACTOR_WORK", 2 ** 20)))
+# Async mode: numbers at least this large, batches at least CPU_BATCH_SIZE
+# long and requests whose factoring work (see MAX_FACTOR_WORK) exceeds
+# CPU_INLINE_FACTOR_WORK are classified in a process pool of CPU_WORKERS
+# processes; anything else is cheap enough to run on the event loop.
+CPU_HEAVY_THRESHOLD = int(float(os.getenv("CPU_HEAVY_THRESHOLD", 2 ** 64)))
+CPU_BATCH_SIZE = int(os.getenv("CPU_BATCH_SIZE", 1000))
+CPU_INLINE_FACTOR_WORK = int(float(os.getenv("CPU_INLINE_FACTOR_WORK", 2 ** 12)))
+CPU_WORKERS = int(os.getenv("CPU_WORKERS", os.cpu_count() or 1))
+# Add a Server-Timing header with per-stage durations to classification responses.
+SERVER_TIMING = os.getenv("SERVER_TIMING", "").strip().lower() in ("1", "true", "yes")
+# Offline artifacts written by scripts/build_index.py; both are optional.
+PROPERTY_INDEX_PATH = os.getenv("PROPERTY_INDEX_PATH", os.path.join(DATA_DIR, "property_index.bin"))
+FACT_SNAPSHOT_PATH = os.getenv("FACT_SNAPSHOT_PATH", os.path.join(DATA_DIR, "facts.json"))
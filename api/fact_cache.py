@@ -0,0 +1,191 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError, wait
+
+class FactCache:
+    # Size-bounded LRU cache for fun facts.
+    #
+    # An entry is fresh for `ttl` seconds, then served stale for another
+    # `stale_ttl` seconds while one background refresh runs; after that it
+    # counts as a miss. Concurrent misses for the same key share a single call
+    # to `fetch`, which returns the fact text or None on failure (failures are
+    # never cached). At most `max_pending` fetches (default 4 per worker) are
+    # queued or running; misses beyond that get None without a fetch.
+
+    def __init__(self, fetch, maxsize=1024, ttl=3600, stale_ttl=86400, workers=8, max_pending=None,
+                 clock=time.monotonic):
+        self.fetch = fetch
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_pending = max_pending or 4 * workers
+        self.clock = clock
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fact-cache")
+        self._counters = dict.fromkeys(
+            ("hits", "stale_hits", "misses", "coalesced", "refreshes", "evictions", "errors", "timeouts",
+             "rejected"), 0)
+
+    def get(self, key, timeout=None):
+        # Returns the cached or freshly fetched fact, or None if the fetch
+        # failed or did not finish within `timeout` seconds. A fetch that
+        # overruns the timeout keeps going and fills the cache when it lands.
+        return self._result(self._lookup(key)[0], timeout)
+
+    def get_many(self, keys, timeout=None, max_fetches=None):
+        # Like get() for several keys at once: misses are fetched concurrently
+        # and share one `timeout`. Only the first `max_fetches` misses and
+        # stale entries start a fetch; later misses get None, so one request
+        # cannot flood the upstream. Returns {key: fact or None}.
+        futures = {}
+        fetches = 0
+        for key in dict.fromkeys(keys):
+            futures[key], started = self._lookup(key, max_fetches is None or fetches < max_fetches)
+            fetches += started
+        wait(futures.values(), timeout)
+        return {key: self._result(future, 0) for key, future in futures.items()}
+
+    def lookup(self, key):
+        # Cache-only lookup for callers that fetch on their own (the async
+        # app): returns (value, "fresh" | "stale" | "miss") and updates the
+        # hit counters, but never starts a fetch.
+        with self._lock:
+            return self._cached(key)
+
+    def lookup_many(self, keys):
+        # lookup() for several keys under one lock: {key: cached fact or None}.
+        with self._lock:
+            return {key: self._cached(key)[0] for key in keys}
+
+    def count(self, name):
+        # Lets external fetchers report misses, coalescing, errors, etc.
+        with self._lock:
+            self._counters[name] += 1
+
+    def put(self, key, value):
+        with self._lock:
+            self._store(key, value)
+
+    def seed(self, facts):
+        # Preloads {key: fact} pairs, e.g. a snapshot bundled with the build.
+        # They age like fetched entries and are refreshed in the background.
+        with self._lock:
+            for key, value in facts.items():
+                self._store(key, value)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+            stats["size"] = len(self._entries)
+            stats["maxsize"] = self.maxsize
+            stats["inflight"] = len(self._inflight)
+        stats["max_pending"] = self.max_pending
+        return stats
+
+    def seed_from_file(self, path):
+        # Seeds from a JSON snapshot of {"n": fact}; a missing or unreadable
+        # file is ignored.
+        try:
+            with open(path) as snapshot:
+                self.seed({int(n): text for n, text in json.load(snapshot).items()})
+        except (OSError, ValueError):
+            pass
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _lookup(self, key, may_fetch=True):
+        # Returns (future, started) for `key`. The future is already resolved
+        # for cached entries, is the (possibly shared) in-flight fetch for a
+        # miss, or resolves to None when no fetch may be started. `started`
+        # tells whether this call queued a new fetch.
+        with self._lock:
+            value, state = self._cached(key)
+            may_fetch = may_fetch and len(self._inflight) < self.max_pending
+            if state != "miss":
+                started = state == "stale" and key not in self._inflight and may_fetch
+                if started:
+                    self._counters["refreshes"] += 1
+                    self._start_fetch(key)
+                return self._resolved(value), started
+            future = self._inflight.get(key)
+            if future is not None:
+                self._counters["coalesced"] += 1
+                return future, False
+            if not may_fetch:
+                self._counters["rejected"] += 1
+                return self._resolved(None), False
+            self._counters["misses"] += 1
+            return self._start_fetch(key), True
+
+    def _resolved(self, value):
+        future = Future()
+        future.set_result(value)
+        return future
+
+    def _cached(self, key):
+        # Caller holds the lock. Returns (value, "fresh" | "stale") for a
+        # usable entry, else (None, "miss"), dropping expired entries.
+        entry = self._entries.get(key)
+        if entry is None:
+            return None, "miss"
+        value, stored_at = entry
+        age = self.clock() - stored_at
+        if age >= self.ttl + self.stale_ttl:
+            del self._entries[key]
+            return None, "miss"
+        self._entries.move_to_end(key)
+        if age < self.ttl:
+            self._counters["hits"] += 1
+            return value, "fresh"
+        self._counters["stale_hits"] += 1
+        return value, "stale"
+
+    def _result(self, future, timeout):
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            with self._lock:
+                self._counters["timeouts"] += 1
+            return None
+        except Exception:
+            return None
+
+    def _start_fetch(self, key):
+        # Caller holds the lock.
+        future = Future()
+        self._inflight[key] = future
+        self._executor.submit(self._run_fetch, key, future)
+        return future
+
+    def _run_fetch(self, key, future):
+        try:
+            value = self.fetch(key)
+        except Exception as exc:
+            value = None
+            error = exc
+        else:
+            error = None
+        with self._lock:
+            del self._inflight[key]
+            if value is None:
+                self._counters["errors"] += 1
+            else:
+                self._store(key, value)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(value)
+
+    def _store(self, key, value):
+        # Caller holds the lock.
+        self._entries[key] = (value, self.clock())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self._counters["evictions"] += 1
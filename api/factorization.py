@@ -0,0 +1,131 @@
+import math
+import random
+from functools import lru_cache
+
+from primality import build_sieve, is_prime
+
+# Trial division covers every prime below this bound before Pollard-rho runs.
+TRIAL_DIVISION_LIMIT = 1000
+
+_sieve = build_sieve(TRIAL_DIVISION_LIMIT)
+TRIAL_PRIMES = (2,) + tuple(2 * i + 1 for i in range(1, len(_sieve)) if _sieve[i])
+del _sieve
+
+def _pollard_rho(n):
+    # Brent's variant; returns a non-trivial factor of the odd composite n.
+    while True:
+        y = random.randrange(1, n)
+        c = random.randrange(1, n)
+        m = 128
+        g = r = q = 1
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(m, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = math.gcd(q, n)
+                k += m
+            r *= 2
+        if g == n:
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = math.gcd(abs(x - ys), n)
+        if g != n:
+            return g
+
+def _integer_root(n, k):
+    # Largest r with r ** k <= n (Newton's method on integers).
+    r = 1 << -(-n.bit_length() // k)
+    while True:
+        s = ((k - 1) * r + n // r ** (k - 1)) // k
+        if s >= r:
+            return r
+        r = s
+
+def _perfect_power(n):
+    # Returns (r, k) with r ** k == n for a prime k, or (n, 1). Pollard-rho
+    # needs about sqrt(p) steps on p ** k, so prime powers are split here.
+    # Trial division has removed every prime below TRIAL_DIVISION_LIMIT, so
+    # r >= TRIAL_DIVISION_LIMIT bounds the exponents worth trying.
+    max_k = n.bit_length() // (TRIAL_DIVISION_LIMIT.bit_length() - 1)
+    for k in TRIAL_PRIMES:
+        if k > max_k:
+            break
+        r = _integer_root(n, k)
+        if r ** k == n:
+            return r, k
+    return n, 1
+
+def _split(n, factors):
+    if n == 1:
+        return
+    if is_prime(n):
+        factors[n] = factors.get(n, 0) + 1
+        return
+    root, k = _perfect_power(n)
+    if k > 1:
+        root_factors = {}
+        _split(root, root_factors)
+        for p, e in root_factors.items():
+            factors[p] = factors.get(p, 0) + e * k
+        return
+    d = _pollard_rho(n)
+    _split(d, factors)
+    _split(n // d, factors)
+
+def factoring_cost(n):
+    # Rough worst-case work to factorize |n|: Pollard-rho needs about
+    # n^(1/4) iterations to split a semiprime with two equal-sized factors.
+    return math.isqrt(math.isqrt(abs(n)))
+
+@lru_cache(maxsize=4096)
+def factorize(n):
+    # Prime factorization of |n| as a sorted tuple of (prime, exponent) pairs.
+    n = abs(n)
+    if n < 2:
+        return ()
+    factors = {}
+    for p in TRIAL_PRIMES:
+        if p * p > n:
+            break
+        if n % p == 0:
+            e = 0
+            while n % p == 0:
+                n //= p
+                e += 1
+            factors[p] = e
+    _split(n, factors)
+    return tuple(sorted(factors.items()))
+
+def prime_factors(n):
+    # Prime factors of |n| with multiplicity, e.g. 12 -> [2, 2, 3].
+    return [p for p, e in factorize(n) for _ in range(e)]
+
+def divisor_count(n):
+    if n == 0:
+        return 0
+    return math.prod(e + 1 for _, e in factorize(n))
+
+def divisor_sum(n):
+    # sigma(|n|): the sum of all positive divisors, including |n| itself.
+    if n == 0:
+        return 0
+    return math.prod((p ** (e + 1) - 1) // (p - 1) for p, e in factorize(n))
+
+def is_perfect(n):
+    if n <= 1:
+        return False
+    # No odd perfect number is known, and none exists below 10^1500
+    # (Ochem & Rao, 2012); factoring anything that large would never finish.
+    if n % 2:
+        return False
+    # Every even perfect number is 2^(p-1) * (2^p - 1) with 2^p - 1 prime.
+    k = (n & -n).bit_length() - 1
+    odd_part = n >> k
+    return odd_part == (1 << (k + 1)) - 1 and is_prime(odd_part)
@@ -0,0 +1,139 @@
+import contextlib
+import contextvars
+import threading
+import time
+
+from config import SERVER_TIMING
+
+# Upper bounds (seconds) of the histogram buckets; classifiers take
+# microseconds, fact fetches and whole requests up to seconds.
+DEFAULT_BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# The RequestTimer of the request being handled, if it is being timed.
+current_timer = contextvars.ContextVar("current_timer", default=None)
+
+class Histogram:
+    # Prometheus-style cumulative histogram; one series per tuple of label
+    # values, e.g. ("classify_number", "is_prime") for labels ("route", "stage").
+
+    def __init__(self, name, help, labels, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, label_values, seconds):
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * len(self.buckets), 0.0, 0]
+            counts = series[0]
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    counts[i] += 1
+            series[1] += seconds
+            series[2] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {key: (list(counts), total, count) for key, (counts, total, count) in self._series.items()}
+        for label_values in sorted(series):
+            counts, total, count = series[label_values]
+            label = ",".join(f'{name}="{value}"' for name, value in zip(self.labels, label_values))
+            for bound, bucket_count in zip(self.buckets, counts):
+                lines.append(f'{self.name}_bucket{{{label},le="{bound}"}} {bucket_count}')
+            lines.append(f'{self.name}_bucket{{{label},le="+Inf"}} {count}')
+            lines.append(f"{self.name}_sum{{{label}}} {total}")
+            lines.append(f"{self.name}_count{{{label}}} {count}")
+        return "\n".join(lines) + "\n"
+
+STAGE_DURATION = Histogram(
+    "classify_stage_duration_seconds",
+    "Time spent in each stage of a request, excluding nested stages.",
+    ("route", "stage"),
+)
+REQUEST_DURATION = Histogram(
+    "classify_request_duration_seconds",
+    "Time spent handling a request, from parsing to serialization.",
+    ("route",),
+)
+
+class RequestTimer:
+    # Collects per-stage durations for one request. Stages may nest (e.g.
+    # fun_fact computing is_armstrong); each stage is charged only for its
+    # own time, so the stage durations add up to the request's total.
+
+    def __init__(self, route):
+        self.route = route
+        self.stages = {}
+        self._started = time.perf_counter()
+        self._nested = []
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        started = time.perf_counter()
+        self._nested.append(0.0)
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            own = elapsed - self._nested.pop()
+            if self._nested:
+                self._nested[-1] += elapsed
+            self.stages[name] = self.stages.get(name, 0.0) + own
+
+    @contextlib.contextmanager
+    def active(self):
+        # Makes this the timer the classification pipeline reports to.
+        token = current_timer.set(self)
+        try:
+            yield self
+        finally:
+            current_timer.reset(token)
+
+    @contextlib.contextmanager
+    def finish_on_error(self):
+        # Records the request even when the block raises, e.g. when parsing
+        # fails and the app answers 400 from its error handler.
+        try:
+            yield
+        except Exception:
+            self.finish()
+            raise
+
+    def finish(self):
+        # Records the request into the histograms.
+        for name, seconds in self.stages.items():
+            STAGE_DURATION.observe((self.route, name), seconds)
+        REQUEST_DURATION.observe((self.route,), time.perf_counter() - self._started)
+
+    def server_timing(self):
+        # Value for the Server-Timing response header (durations in ms).
+        return ", ".join(f"{name};dur={seconds * 1000:.3f}" for name, seconds in self.stages.items())
+
+def timed(response, timer):
+    # Records the request's stage timings, optionally echoing them in a
+    # Server-Timing header. Works with Flask and Starlette responses.
+    timer.finish()
+    if SERVER_TIMING:
+        response.headers["Server-Timing"] = timer.server_timing()
+    return response
+
+def render_counters(name, help, label, counters):
+    # Renders {label value: number} as a Prometheus gauge family.
+    lines = [f"# HELP {name} {help}", f"# TYPE {name} gauge"]
+    lines.extend(f'{name}{{{label}="{key}"}} {value}' for key, value in sorted(counters.items())
+                 if isinstance(value, (int, float)))
+    return "\n".join(lines) + "\n"
+
+def render(fact_cache_stats=None):
+    # Full /metrics payload in the Prometheus text exposition format.
+    parts = [STAGE_DURATION.render(), REQUEST_DURATION.render()]
+    if fact_cache_stats is not None:
+        parts.append(render_counters(
+            "fact_cache_events", "Fact cache counters and sizes since startup.", "event", fact_cache_stats))
+    return "".join(parts)
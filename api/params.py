@@ -0,0 +1,136 @@
+from config import MAX_BATCH_SIZE, MAX_BATCH_VALUE, MAX_FACTOR_WORK, MAX_STREAM_VALUE
+from pipeline import FACTOR_FIELDS, factoring_work, parse_fields
+
+# Request validation shared by the Flask app and the ASGI app. Each helper
+# takes the query-string mapping (and body, where there is one) and raises
+# InvalidRequest with the 400 payload to return.
+
+class InvalidRequest(ValueError):
+    def __init__(self, message, number=None):
+        super().__init__(message)
+        self.payload = {} if number is None else {"number": number}
+        self.payload.update({"error": True, "message": message})
+
+def parse_number(value):
+    # Same rule as the single-number route: accept any numeric value and
+    # truncate it to an integer. Raises ValueError for anything else.
+    if isinstance(value, bool):
+        raise ValueError(value)
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        value = value.strip()
+    return int(float(value))
+
+def parse_int_param(args, name, default=None):
+    raw = args.get(name)
+    if raw is None or raw.strip() == "":
+        if default is None:
+            raise InvalidRequest(f"{name} parameter is required")
+        return default
+    try:
+        return int(raw.strip())
+    except ValueError:
+        raise InvalidRequest(f"Invalid {name} parameter")
+
+def fields_param(args, number=None):
+    # Optional comma-separated subset of fields, e.g. ?fields=is_prime,digit_sum
+    try:
+        return parse_fields(args.get('fields'))
+    except ValueError as exc:
+        raise InvalidRequest(str(exc), number)
+
+def check_factoring(numbers, fields, number=None):
+    # Refuses factor fields when factorizing `numbers` could take too long.
+    if factoring_work(numbers, fields) > MAX_FACTOR_WORK:
+        raise InvalidRequest(
+            f"Numbers too large to factorize; drop {', '.join(FACTOR_FIELDS)} from fields", number)
+
+def single_request(args):
+    # Returns (n, fields) for GET /api/classify-number.
+    num_param = args.get('number')
+
+    # Check for missing or empty input.
+    if not num_param or num_param.strip() == "":
+        raise InvalidRequest("Number parameter is required", "missing")
+
+    # Strip any surrounding whitespace.
+    num_param = num_param.strip()
+    fields = fields_param(args, num_param)
+
+    try:
+        # Convert input to float to accept integers, negatives, and floats.
+        n_val = float(num_param)
+    except ValueError:
+        raise InvalidRequest("Invalid number format", num_param)
+
+    # For classification, convert to an integer.
+    # This means a valid float will be truncated (e.g., 3.14 becomes 3).
+    n = int(n_val)
+    check_factoring([n], fields, num_param)
+    return n, fields
+
+def batch_request(args, payload):
+    # Returns (numbers, fields) for POST /api/classify-numbers. Accepts
+    # [1, 2, 3], {"numbers": [...]} or {"start": a, "end": b} (end inclusive).
+    fields = fields_param(args)
+    if isinstance(payload, dict) and "numbers" in payload:
+        payload = payload["numbers"]
+    if isinstance(payload, list):
+        if len(payload) > MAX_BATCH_SIZE:
+            raise InvalidRequest(f"Batch size exceeds the limit of {MAX_BATCH_SIZE} numbers")
+        numbers = []
+        for index, value in enumerate(payload):
+            try:
+                numbers.append(parse_number(value))
+            except (TypeError, ValueError, OverflowError):
+                raise InvalidRequest(f"Invalid number format at index {index}")
+            if abs(numbers[-1]) > MAX_BATCH_VALUE:
+                raise InvalidRequest(f"Number at index {index} must be within ±{MAX_BATCH_VALUE}")
+        check_factoring(numbers, fields)
+        return numbers, fields
+    if isinstance(payload, dict) and "start" in payload and "end" in payload:
+        try:
+            start = parse_number(payload["start"])
+            end = parse_number(payload["end"])
+        except (TypeError, ValueError, OverflowError):
+            raise InvalidRequest("Invalid range bounds")
+        if end < start:
+            raise InvalidRequest("Range end must not be less than start")
+        if max(abs(start), abs(end)) > MAX_BATCH_VALUE:
+            raise InvalidRequest(f"Range bounds must be within ±{MAX_BATCH_VALUE}")
+        if end - start + 1 > MAX_BATCH_SIZE:
+            raise InvalidRequest(f"Batch size exceeds the limit of {MAX_BATCH_SIZE} numbers")
+        numbers = list(range(start, end + 1))
+        check_factoring(numbers, fields)
+        return numbers, fields
+    raise InvalidRequest("Expected a JSON array of numbers, {\"numbers\": [...]} or {\"start\": ..., \"end\": ...}")
+
+def range_request(args):
+    # Returns (first, stop, next_cursor, fields) for GET /api/classify-range:
+    # the numbers to stream are first..stop inclusive, and next_cursor is
+    # the value for the X-Next-Cursor header ("" once the range is done).
+    fields = fields_param(args)
+    start = parse_int_param(args, 'start')
+    end = parse_int_param(args, 'end')
+    # Resume from `cursor` (the next number to emit) after an interrupted stream.
+    cursor = parse_int_param(args, 'cursor', start)
+    limit = parse_int_param(args, 'limit', 0)
+    if end < start:
+        raise InvalidRequest("Range end must not be less than start")
+    if max(abs(start), abs(end)) > MAX_STREAM_VALUE:
+        raise InvalidRequest(f"Range bounds must be within ±{MAX_STREAM_VALUE}")
+    # Lines are streamed as they are produced, so only each number's own
+    # factorization has to fit the budget.
+    check_factoring([max(abs(start), abs(end))], fields)
+    if not start <= cursor <= end + 1:
+        raise InvalidRequest("Cursor must lie within the range")
+    if limit < 0:
+        raise InvalidRequest("Invalid limit parameter")
+
+    if args.get('facts', '').strip().lower() in ("0", "false", "no"):
+        fields = tuple(name for name in fields if name != "fun_fact")
+
+    stop = min(end, cursor + limit - 1) if limit else end
+    next_cursor = str(stop + 1) if stop < end else ""
+    return cursor, stop, next_cursor, fields
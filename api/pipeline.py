@@ -0,0 +1,157 @@
+import property_index
+from metrics import current_timer
+from primality import is_prime
+from factorization import divisor_count, divisor_sum, factoring_cost, is_perfect, prime_factors
+
+NO_FUN_FACT = "No fun fact available."
+
+# Precomputed lookups for the hot range, or None when no index was built.
+INDEX = property_index.load()
+
+# Field name -> function computing it from a NumberProfile.
+FIELDS = {}
+
+# Fields returned when a request does not ask for a specific subset.
+DEFAULT_FIELDS = (
+    "is_prime",
+    "is_perfect",
+    "properties",
+    "digit_sum",
+    "fun_fact",
+)
+
+# Fields that need a full factorization; they are only computed on request.
+FACTOR_FIELDS = ("prime_factors", "divisor_count", "divisor_sum")
+
+def field(name):
+    def register(func):
+        FIELDS[name] = func
+        return func
+    return register
+
+class NumberProfile:
+    # Computes each field of one number on first access and remembers it, so
+    # fields that depend on each other never repeat work.
+    __slots__ = ("n", "fetch_fact", "index", "_values")
+
+    def __init__(self, n, fetch_fact=None, values=None):
+        self.n = n
+        self.fetch_fact = fetch_fact
+        self.index = INDEX if INDEX is not None and INDEX.covers(n) else None
+        # Fields already computed elsewhere (e.g. by the batch kernels).
+        self._values = dict(values) if values else {}
+
+    def __getitem__(self, name):
+        try:
+            return self._values[name]
+        except KeyError:
+            pass
+        timer = current_timer.get()
+        if timer is None:
+            value = FIELDS[name](self)
+        else:
+            with timer.stage(name):
+                value = FIELDS[name](self)
+        self._values[name] = value
+        return value
+
+def parse_fields(raw):
+    # Turns "is_prime,digit_sum" into a tuple of known field names; raises
+    # ValueError naming any unknown ones.
+    if raw is None or raw.strip() == "":
+        return DEFAULT_FIELDS
+    # "number" is accepted but not a field: it is always included.
+    names = tuple(dict.fromkeys(name.strip() for name in raw.split(",")
+                                if name.strip() and name.strip() != "number"))
+    unknown = [name for name in names if name not in FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)}")
+    return names
+
+def factoring_work(numbers, fields):
+    # Estimated factorization work for classifying `numbers` with `fields`
+    # (see factorization.factoring_cost); 0 when no factor field is wanted.
+    if not any(name in FACTOR_FIELDS for name in fields):
+        return 0
+    return sum(factoring_cost(n) for n in numbers)
+
+def classify(n, fields=DEFAULT_FIELDS, fetch_fact=None, values=None):
+    profile = NumberProfile(n, fetch_fact, values)
+    result = {"number": n}
+    for name in fields:
+        result[name] = profile[name]
+    return result
+
+@field("digits")
+def _digits(profile):
+    return str(abs(profile.n))
+
+@field("digit_powers")
+def _digit_powers(profile):
+    digits = profile["digits"]
+    power = len(digits)
+    return [int(d) ** power for d in digits]
+
+@field("digit_sum")
+def _digit_sum(profile):
+    if profile.index is not None:
+        return profile.index.digit_sum(profile.n)
+    return sum(map(int, profile["digits"]))
+
+@field("is_armstrong")
+def _is_armstrong(profile):
+    if profile.index is not None:
+        return profile.index.is_armstrong(profile.n)
+    # Use absolute value for Armstrong check so negative numbers work
+    return sum(profile["digit_powers"]) == abs(profile.n)
+
+@field("is_prime")
+def _is_prime(profile):
+    if profile.index is not None:
+        return profile.index.is_prime(profile.n)
+    return is_prime(profile.n)
+
+@field("is_perfect")
+def _is_perfect(profile):
+    if profile.index is not None:
+        return profile.index.is_perfect(profile.n)
+    return is_perfect(profile.n)
+
+@field("parity")
+def _parity(profile):
+    return "even" if profile.n % 2 == 0 else "odd"
+
+@field("prime_factors")
+def _prime_factors(profile):
+    return prime_factors(profile.n)
+
+@field("divisor_count")
+def _divisor_count(profile):
+    return divisor_count(profile.n)
+
+@field("divisor_sum")
+def _divisor_sum(profile):
+    return divisor_sum(profile.n)
+
+@field("properties")
+def _properties(profile):
+    properties = []
+    if profile["is_prime"]:
+        properties.append("prime")
+    if profile["is_perfect"]:
+        properties.append("perfect")
+    if profile["is_armstrong"]:
+        properties.append("armstrong")
+    properties.append(profile["parity"])
+    return properties
+
+@field("fun_fact")
+def _fun_fact(profile):
+    n = profile.n
+    if profile["is_armstrong"]:
+        digits = profile["digits"]
+        power = len(digits)
+        return f"{n} is an Armstrong number because " + " + ".join(f"{d}^{power}" for d in digits) + f" = {n}"
+    if profile.fetch_fact is None:
+        return NO_FUN_FACT
+    return profile.fetch_fact(n)
@@ -0,0 +1,120 @@
+import math
+import os
+
+# Numbers up to this limit are answered from a precomputed sieve table.
+SIEVE_LIMIT = int(os.getenv("PRIME_SIEVE_LIMIT", 1 << 20))
+
+# Bases that make Miller-Rabin deterministic for every n < 2^64.
+MR_BASES_64 = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+SMALL_PRIMES = MR_BASES_64 + (41, 43, 47, 53, 59, 61, 67, 71, 73, 79, 83, 89, 97)
+
+_sieve = None
+
+def build_sieve(limit):
+    # Odd-only sieve: index i stands for the odd number 2*i + 1.
+    size = limit // 2 + 1
+    table = bytearray([1]) * size
+    table[0] = 0
+    for i in range(1, (math.isqrt(limit) - 1) // 2 + 1):
+        if table[i]:
+            p = 2 * i + 1
+            start = p * p // 2
+            table[start::p] = bytes(len(range(start, size, p)))
+    return table
+
+def _get_sieve():
+    # Built lazily so importing the module stays cheap.
+    global _sieve
+    if _sieve is None:
+        _sieve = build_sieve(SIEVE_LIMIT)
+    return _sieve
+
+def _is_strong_probable_prime(n, a):
+    d = n - 1
+    s = 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    x = pow(a, d, n)
+    if x == 1 or x == n - 1:
+        return True
+    for _ in range(s - 1):
+        x = x * x % n
+        if x == n - 1:
+            return True
+    return False
+
+def _jacobi(a, n):
+    a %= n
+    result = 1
+    while a:
+        while a % 2 == 0:
+            a //= 2
+            if n % 8 in (3, 5):
+                result = -result
+        a, n = n, a
+        if a % 4 == 3 and n % 4 == 3:
+            result = -result
+        a %= n
+    return result if n == 1 else 0
+
+def _is_strong_lucas_probable_prime(n):
+    # Selfridge's method A: first D in 5, -7, 9, -11, ... with (D/n) = -1.
+    if math.isqrt(n) ** 2 == n:
+        return False
+    D = 5
+    while True:
+        j = _jacobi(D, n)
+        if j == -1:
+            break
+        if j == 0 and abs(D) != n:
+            return False
+        D = -D - 2 if D > 0 else -D + 2
+    P = 1
+    Q = (1 - D) // 4
+
+    d = n + 1
+    s = 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+
+    # Walk the bits of d, keeping U_k, V_k and Q^k (mod n).
+    U, V, Qk = 1, P, Q % n
+    for bit in bin(d)[3:]:
+        U = U * V % n
+        V = (V * V - 2 * Qk) % n
+        Qk = Qk * Qk % n
+        if bit == "1":
+            U, V = (P * U + V) % n, (D * U + P * V) % n
+            if U % 2:
+                U += n
+            if V % 2:
+                V += n
+            U //= 2
+            V //= 2
+            Qk = Qk * Q % n
+
+    if U == 0 or V == 0:
+        return True
+    for _ in range(s - 1):
+        V = (V * V - 2 * Qk) % n
+        if V == 0:
+            return True
+        Qk = Qk * Qk % n
+    return False
+
+def is_prime(n):
+    if n < 2:
+        return False
+    if n <= SIEVE_LIMIT:
+        if n % 2 == 0:
+            return n == 2
+        return bool(_get_sieve()[n // 2])
+    for p in SMALL_PRIMES:
+        if n % p == 0:
+            return n == p
+    if n < 1 << 64:
+        return all(_is_strong_probable_prime(n, a) for a in MR_BASES_64)
+    # Baillie-PSW: no composite passing both tests is known.
+    return _is_strong_probable_prime(n, 2) and _is_strong_lucas_probable_prime(n)
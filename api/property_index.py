@@ -0,0 +1,95 @@
+import mmap
+import struct
+
+from config import PROPERTY_INDEX_PATH
+
+# Precomputed properties of every number in [0, limit], built offline by
+# scripts/build_index.py and memory-mapped read-only at startup. Nothing is
+# copied or decoded when the file is opened; each lookup reads a byte or two.
+#
+# File layout (little-endian):
+#   header   MAGIC, limit, perfect count, armstrong count,
+#            primes offset/length, digit sums offset/length
+#   uint64   perfect numbers <= limit
+#   uint64   Armstrong numbers <= limit
+#   bitset   primality of odd numbers: bit i of the bitset is 2*i + 1
+#   uint8    digit sum of every n in [0, limit]
+MAGIC = b"NUMIDX01"
+HEADER = struct.Struct("<8sQII4Q")
+
+class PropertyIndex:
+    def __init__(self, buffer):
+        magic, limit, n_perfect, n_armstrong, primes_offset, primes_length, sums_offset, sums_length = \
+            HEADER.unpack_from(buffer)
+        if magic != MAGIC:
+            raise ValueError("Not a property index file")
+        self.limit = limit
+        offset = HEADER.size
+        self.perfect = frozenset(struct.unpack_from(f"<{n_perfect}Q", buffer, offset))
+        offset += 8 * n_perfect
+        self.armstrong = frozenset(struct.unpack_from(f"<{n_armstrong}Q", buffer, offset))
+        view = memoryview(buffer)
+        self._primes = view[primes_offset:primes_offset + primes_length]
+        self._digit_sums = view[sums_offset:sums_offset + sums_length]
+
+    @classmethod
+    def open(cls, path=PROPERTY_INDEX_PATH):
+        with open(path, "rb") as handle:
+            buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(buffer)
+
+    def covers(self, n):
+        return -self.limit <= n <= self.limit
+
+    def is_prime(self, n):
+        if n < 3:
+            return n == 2
+        if n % 2 == 0:
+            return False
+        i = n // 2
+        return bool(self._primes[i >> 3] >> (i & 7) & 1)
+
+    def is_perfect(self, n):
+        return n in self.perfect
+
+    def is_armstrong(self, n):
+        return abs(n) in self.armstrong
+
+    def digit_sum(self, n):
+        return self._digit_sums[abs(n)]
+
+def load(path=PROPERTY_INDEX_PATH):
+    # Returns the index at `path`, or None when it has not been built.
+    try:
+        return PropertyIndex.open(path)
+    except (OSError, ValueError, struct.error):
+        return None
+
+def build(path, limit, segment_size=1 << 20):
+    # Writes an index for [0, limit]. Needs NumPy, which the service itself
+    # does not import to read the file.
+    import numpy as np
+    from batch import PERFECT_INT64, armstrong_kernel, digit_kernel, sieve_array
+
+    is_p = sieve_array(limit)
+    primes = np.packbits(is_p[1::2], bitorder="little").tobytes()
+    del is_p
+
+    perfect = [int(n) for n in PERFECT_INT64 if n <= limit]
+    armstrong = []
+    digit_sums = bytearray(limit + 1)
+    for low in range(0, limit + 1, segment_size):
+        values = np.arange(low, min(low + segment_size, limit + 1), dtype=np.int64)
+        sums, counts = digit_kernel(values)
+        digit_sums[low:low + len(values)] = sums.astype(np.uint8).tobytes()
+        armstrong.extend(values[armstrong_kernel(values, counts)].tolist())
+
+    primes_offset = HEADER.size + 8 * (len(perfect) + len(armstrong))
+    sums_offset = primes_offset + len(primes)
+    with open(path, "wb") as handle:
+        handle.write(HEADER.pack(MAGIC, limit, len(perfect), len(armstrong),
+                                 primes_offset, len(primes), sums_offset, len(digit_sums)))
+        handle.write(struct.pack(f"<{len(perfect)}Q", *perfect))
+        handle.write(struct.pack(f"<{len(armstrong)}Q", *armstrong))
+        handle.write(primes)
+        handle.write(digit_sums)
@@ -0,0 +1,39 @@
+import json
+
+from batch import classify_rows, segmented_sieve, vectorized_columns
+
+# Numbers sieved and kernel-classified together; bounds memory per request.
+SEGMENT_SIZE = 32768
+
+# NDJSON lines joined into one chunk of the HTTP response.
+CHUNK_LINES = 512
+
+def classify_range(start, end, fields, fact_lookup=None, segment_size=SEGMENT_SIZE):
+    # Yields one classify()-shaped dict per number in [start, end], in order.
+    for values, prime_flags in segmented_sieve(start, end, segment_size):
+        columns = vectorized_columns(values, fields, prime_flags)
+        numbers = values.tolist()
+        for offset in range(0, len(numbers), CHUNK_LINES):
+            chunk = numbers[offset:offset + CHUNK_LINES]
+            per_item = [{name: column[offset + row] for name, column in columns.items()}
+                        for row in range(len(chunk))]
+            yield from classify_rows(chunk, per_item, fields, fact_lookup)
+
+def chunked(results, chunk_lines=CHUNK_LINES):
+    # Groups results into lists of at most `chunk_lines`. Being a generator,
+    # nothing past the chunk currently being written is computed.
+    chunk = []
+    for result in results:
+        chunk.append(result)
+        if len(chunk) == chunk_lines:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def ndjson(chunk):
+    return "".join(json.dumps(result, separators=(",", ":")) + "\n" for result in chunk)
+
+def ndjson_chunks(results, chunk_lines=CHUNK_LINES):
+    for chunk in chunked(results, chunk_lines):
+        yield ndjson(chunk)
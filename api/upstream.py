@@ -0,0 +1,156 @@
+import threading
+import time
+
+class CircuitBreaker:
+    # Opens after `failure_threshold` consecutive failures and rejects calls
+    # for `reset_timeout` seconds; then lets a single probe through
+    # (half-open) and closes again if it succeeds.
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=5, reset_timeout=30, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.times_opened = 0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                if self.clock() - self.opened_at < self.reset_timeout:
+                    return False
+                self.state = self.HALF_OPEN
+            if self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def release(self):
+        # Gives back a call allowed by allow() that never reached the
+        # upstream, so it neither counts as a failure nor holds the probe.
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.times_opened += 1
+                self.state = self.OPEN
+                self.opened_at = self.clock()
+
+    def stats(self):
+        with self._lock:
+            stats = {
+                "state": self.state,
+                "consecutive_failures": self.failures,
+                "failure_threshold": self.failure_threshold,
+                "reset_timeout": self.reset_timeout,
+                "times_opened": self.times_opened,
+            }
+            if self.state == self.OPEN:
+                stats["retry_in"] = max(0.0, self.reset_timeout - (self.clock() - self.opened_at))
+        return stats
+
+class NumbersApiClient:
+    # Fetches facts over one pooled keep-alive session, guarded by a
+    # CircuitBreaker so an unhealthy upstream fails fast.
+
+    def __init__(self, base_url, timeout=3, pool_size=8, breaker=None):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.breaker = breaker or CircuitBreaker()
+        self._session = None
+        self._adapter = None
+        self._lock = threading.Lock()
+        self._counters = dict.fromkeys(("requests", "failures", "short_circuited"), 0)
+
+    @property
+    def session(self):
+        # Created on first use: importing requests is a noticeable share of
+        # cold-start time, and a warm fact cache may never need it.
+        with self._lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, max_retries=0)
+                session = requests.Session()
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._adapter = adapter
+                self._session = session
+            return self._session
+
+    def fetch_fact(self, n):
+        # Returns the fact text, or None so that failures are not cached.
+        if not self.breaker.allow():
+            self._count("short_circuited")
+            return None
+        session = self.session
+        import requests
+
+        self._count("requests")
+        try:
+            fact_response = session.get(f"{self.base_url}/{n}/math?json", timeout=self.timeout)
+            if fact_response.status_code >= 500:
+                raise requests.HTTPError(f"Numbers API returned {fact_response.status_code}")
+            text = fact_response.json().get("text") if fact_response.status_code == 200 else None
+        except (requests.RequestException, ValueError, AttributeError):
+            self._count("failures")
+            self.breaker.record_failure()
+            return None
+        self.breaker.record_success()
+        return text
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+        stats["breaker"] = self.breaker.stats()
+        stats["pool"] = self.pool_stats()
+        return stats
+
+    def pool_stats(self):
+        pools = []
+        if self._adapter is None:
+            return {"maxsize": self.pool_size, "pools": pools}
+        container = self._adapter.poolmanager.pools
+        for key in list(container.keys()):
+            pool = container.get(key)
+            if pool is None:
+                continue
+            pools.append({
+                "host": pool.host,
+                "port": pool.port,
+                "connections_opened": pool.num_connections,
+                "requests": pool.num_requests,
+                # The queue is pre-filled with None placeholders for unopened slots.
+                "idle_connections": sum(1 for conn in list(pool.pool.queue) if conn is not None)
+                if pool.pool is not None else 0,
+            })
+        return {"maxsize": self.pool_size, "pools": pools}
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
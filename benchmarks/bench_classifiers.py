@@ -0,0 +1,109 @@
+"""Microbenchmarks for each classifier across input magnitudes.
+
+Inputs are drawn with a fixed seed and passed through float() like the API
+does, so numbers above 2^53 have the same shape as real requests. The
+precomputed property index is disabled and factorization bypasses its
+cache, so every call does the full computation. Run from the repository
+root:
+
+    python benchmarks/bench_classifiers.py --json baseline.json
+    python benchmarks/bench_classifiers.py --compare baseline.json
+
+--compare exits with status 1 if any classifier got slower than
+--threshold times its baseline.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "api"))
+
+import pipeline  # noqa: E402
+from factorization import factorize, is_perfect  # noqa: E402
+from pipeline import NumberProfile  # noqa: E402
+from primality import is_prime  # noqa: E402
+
+MAGNITUDES = (2, 4, 6, 9, 12, 15, 18, 30, 100, 300)
+SAMPLES = 50
+SEED = 20240601
+
+def field(name):
+    return lambda n: NumberProfile(n)[name]
+
+CLASSIFIERS = {
+    "is_prime": is_prime,
+    "is_perfect": is_perfect,
+    "is_armstrong": field("is_armstrong"),
+    "digit_sum": field("digit_sum"),
+    "factorize": factorize.__wrapped__,
+}
+
+def inputs(digits, rng):
+    return [int(float(rng.randrange(10 ** (digits - 1), 10 ** digits))) for _ in range(SAMPLES)]
+
+def time_per_call(func, numbers, repeat=5):
+    # Best of `repeat` passes over `numbers`, in seconds per call.
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            for n in numbers:
+                func(n)
+        elapsed = time.perf_counter() - started
+        if elapsed >= 0.05:
+            break
+        loops *= 4
+    best = elapsed
+    for _ in range(repeat - 1):
+        started = time.perf_counter()
+        for _ in range(loops):
+            for n in numbers:
+                func(n)
+        best = min(best, time.perf_counter() - started)
+    return best / (loops * len(numbers))
+
+def run():
+    pipeline.INDEX = None
+    is_prime(2)  # build the sieve outside the timed region
+    rng = random.Random(SEED)
+    samples = {digits: inputs(digits, rng) for digits in MAGNITUDES}
+    return {name: {str(digits): time_per_call(func, samples[digits]) for digits in MAGNITUDES}
+            for name, func in CLASSIFIERS.items()}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--compare", help="baseline file written by --json")
+    parser.add_argument("--threshold", type=float, default=2.0)
+    args = parser.parse_args()
+
+    results = run()
+    print(f"{'microseconds per call':<22}" + "".join(f"{'1e' + str(d):>10}" for d in MAGNITUDES))
+    for name, timings in results.items():
+        print(f"{name:<22}" + "".join(f"{timings[str(d)] * 1e6:10.2f}" for d in MAGNITUDES))
+
+    if args.json:
+        with open(args.json, "w") as handle:
+            json.dump(results, handle, indent=2)
+
+    if args.compare:
+        with open(args.compare) as handle:
+            baseline = json.load(handle)
+        regressions = [
+            (name, digits, timing / baseline[name][digits])
+            for name, timings in results.items()
+            for digits, timing in timings.items()
+            if name in baseline and digits in baseline[name]
+            and timing > baseline[name][digits] * args.threshold
+        ]
+        for name, digits, ratio in regressions:
+            print(f"REGRESSION {name} at 1e{digits}: {ratio:.2f}x slower than baseline")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold}x")
+
+if __name__ == "__main__":
+    main()
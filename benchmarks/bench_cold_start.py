@@ -0,0 +1,66 @@
+"""Measure cold-start cost of the Flask app in fresh interpreter processes.
+
+For each scenario a new Python process imports api/classify_number.py and
+serves one request through Flask's test client; the import time and
+first-request latency are reported as medians over --runs processes. The
+"index" scenario uses api/data/property_index.bin; "no index" points
+PROPERTY_INDEX_PATH elsewhere so every property is computed. "eager" first
+imports what the original app imported at startup (flask, flask_cors and
+requests), to show what loading requests lazily saves. Run from the repository root:
+
+    python benchmarks/bench_cold_start.py --runs 10
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# Runs inside the fresh process; prints timings as JSON.
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+for module in filter(None, sys.argv[2].split(",")):
+    __import__(module)
+import classify_number
+imported = time.perf_counter()
+response = classify_number.app.test_client().get(sys.argv[1])
+assert response.status_code == 200, response.status_code
+done = time.perf_counter()
+print(json.dumps({"import": imported - started, "first_request": done - imported}))
+"""
+
+# Startup imports of the original app; requests is now imported on first use.
+EAGER_MODULES = ("flask", "flask_cors", "requests")
+
+def measure(env, preload, url, runs):
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", PROBE, url, ",".join(preload)], cwd=os.path.join(ROOT, "api"),
+                                env=env, check=True, capture_output=True, text=True).stdout
+        samples.append(json.loads(output))
+    return {key: statistics.median(sample[key] for sample in samples) for key in samples[0]}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--number", type=int, default=999983)
+    args = parser.parse_args()
+
+    # Skip the network so only local work is timed.
+    url = f"/api/classify-number?number={args.number}&fields=is_prime,is_perfect,properties,digit_sum"
+    scenarios = {
+        "index": (dict(os.environ), ()),
+        "no index": (dict(os.environ, PROPERTY_INDEX_PATH=os.devnull), ()),
+        "eager": (dict(os.environ), EAGER_MODULES),
+    }
+    print(f"{'scenario':<10} {'import ms':>10} {'first request ms':>17}")
+    for name, (env, preload) in scenarios.items():
+        timings = measure(env, preload, url, args.runs)
+        print(f"{name:<10} {timings['import'] * 1000:10.1f} {timings['first_request'] * 1000:17.2f}")
+
+if __name__ == "__main__":
+    main()
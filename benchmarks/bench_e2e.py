@@ -0,0 +1,99 @@
+"""End-to-end throughput and latency of the API against a local stub.
+
+Starts benchmarks/stub_numbers_api.py (with --delay of upstream latency)
+and one server (--mode sync: gunicorn + Flask, async: uvicorn + ASGI), then
+drives GET /api/classify-number through three scenarios:
+
+    hot       the same 10 numbers over and over (fact cache warmed first)
+    cold      a new number on every request (every fact is fetched)
+    no-facts  new numbers, ?fields without fun_fact (pure computation)
+
+Each scenario reports throughput and latency percentiles and checks p99
+against --slo (the README's 500 ms target). Afterwards the server's
+/metrics histograms are summarised as mean time per stage. Run from the
+repository root:
+
+    python benchmarks/bench_e2e.py --mode sync --requests 500 --concurrency 8
+"""
+import argparse
+import asyncio
+import os
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+import httpx
+
+from loadtest import ROOT, free_port, percentile, run_load, server_commands, wait_until_up
+from stub_numbers_api import StubNumbersApi
+
+NO_FACT_FIELDS = "is_prime,is_perfect,properties,digit_sum,prime_factors,divisor_count"
+
+HOT_NUMBERS = range(100, 110)
+
+def scenarios(requests):
+    return {
+        "hot": ([HOT_NUMBERS[i % len(HOT_NUMBERS)] for i in range(requests)], None),
+        "cold": (range(10 ** 6, 10 ** 6 + requests), None),
+        "no-facts": (range(2 * 10 ** 6, 2 * 10 ** 6 + requests), {"fields": NO_FACT_FIELDS}),
+    }
+
+def stage_means(metrics_text):
+    # Mean seconds per stage from the _sum/_count series of /metrics.
+    sums = defaultdict(float)
+    counts = defaultdict(int)
+    pattern = re.compile(r'classify_stage_duration_seconds_(sum|count)\{route="classify_number",stage="([^"]+)"\} (\S+)')
+    for kind, stage, value in pattern.findall(metrics_text):
+        if kind == "sum":
+            sums[stage] += float(value)
+        else:
+            counts[stage] += int(float(value))
+    return {stage: sums[stage] / counts[stage] for stage in counts if counts[stage]}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", choices=("sync", "async"), default="sync")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--delay", type=float, default=0.1, help="upstream delay in seconds")
+    parser.add_argument("--slo", type=float, default=0.5, help="p99 latency target in seconds")
+    args = parser.parse_args()
+
+    with StubNumbersApi(delay=args.delay, seed=0) as stub:
+        env = dict(os.environ, NUMBERS_API_URL=stub.url, PROPERTY_INDEX_PATH=os.devnull,
+                   FACT_SNAPSHOT_PATH=os.devnull)
+        port = free_port()
+        server = subprocess.Popen(server_commands(port, args.workers)[args.mode], cwd=ROOT, env=env)
+        try:
+            base_url = f"http://127.0.0.1:{port}"
+            asyncio.run(wait_until_up(base_url + "/"))
+            print(f"{args.mode} mode, {args.workers} workers, {args.requests} requests per scenario, "
+                  f"concurrency {args.concurrency}, upstream delay {args.delay * 1000:.0f}ms")
+            print(f"{'scenario':<9} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}  slo")
+            # Every worker keeps its own cache; repeat enough to reach them all.
+            asyncio.run(run_load(base_url, list(HOT_NUMBERS) * 20 * args.workers, args.concurrency))
+            failed = False
+            for name, (numbers, params) in scenarios(args.requests).items():
+                elapsed, latencies = asyncio.run(run_load(base_url, numbers, args.concurrency, params))
+                p99 = percentile(latencies, 0.99)
+                failed |= p99 > args.slo
+                print(f"{name:<9} {len(latencies) / elapsed:8.1f} "
+                      f"{statistics.median(latencies) * 1000:8.1f} "
+                      f"{percentile(latencies, 0.95) * 1000:8.1f} {p99 * 1000:8.1f}  "
+                      f"{'FAIL' if p99 > args.slo else 'ok'}")
+
+            # Each worker process keeps its own histograms; this samples one.
+            means = stage_means(httpx.get(base_url + "/metrics").text)
+            print("\nmean time per stage (one worker):")
+            for stage, seconds in sorted(means.items(), key=lambda item: -item[1]):
+                print(f"  {stage:<14} {seconds * 1e6:10.1f} us")
+        finally:
+            server.terminate()
+            server.wait()
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Compare api/primality.is_prime against the original trial-division check.
+
+Run from the repository root:
+
+    python benchmarks/bench_primality.py
+"""
+import math
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "api"))
+
+from primality import is_prime  # noqa: E402
+
+# Trial division is skipped above this size; a single call would take minutes.
+TRIAL_DIVISION_MAX = 10 ** 14
+
+CASES = [
+    ("small prime", 7919),
+    ("small composite", 7917),
+    ("sieve edge prime", 1048573),
+    ("1e12 prime", 999999999989),
+    ("1e14 prime", 100000000000031),
+    ("1e18 prime", 1000000000000000003),
+    ("2^61 - 1", (1 << 61) - 1),
+    ("30-digit prime", 100000000000000000000000000319),
+    ("2^127 - 1", (1 << 127) - 1),
+    ("1e30 composite", 10 ** 30 + 1),
+]
+
+def trial_division_is_prime(n):
+    if n < 2:
+        return False
+    for i in range(2, int(math.sqrt(n)) + 1):
+        if n % i == 0:
+            return False
+    return True
+
+def time_call(func, n):
+    timer = timeit.Timer(lambda: func(n))
+    loops, _ = timer.autorange()
+    return min(timer.repeat(repeat=3, number=loops)) / loops
+
+def main():
+    is_prime(2)  # build the sieve outside the timed region
+    print(f"{'case':<18} {'n':>40} {'engine':>12} {'trial div':>12} {'speedup':>10}")
+    for label, n in CASES:
+        engine = time_call(is_prime, n)
+        if n <= TRIAL_DIVISION_MAX:
+            assert is_prime(n) == trial_division_is_prime(n), n
+            legacy = time_call(trial_division_is_prime, n)
+            legacy_text = f"{legacy * 1e6:10.1f}us"
+            speedup = f"{legacy / engine:9.0f}x"
+        else:
+            legacy_text = f"{'skipped':>12}"
+            speedup = f"{'-':>10}"
+        print(f"{label:<18} {n:>40} {engine * 1e6:10.2f}us {legacy_text} {speedup}")
+
+if __name__ == "__main__":
+    main()
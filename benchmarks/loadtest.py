@@ -0,0 +1,106 @@
+"""Load-test the sync (gunicorn + Flask) and async (uvicorn + ASGI) servers.
+
+Both servers are started locally against benchmarks/stub_numbers_api.py with
+an injected upstream delay. Every request asks for a different number, so
+each one misses the fact cache and waits on the upstream; this is the case
+where sync workers run out. Run from the repository root:
+
+    python benchmarks/loadtest.py --requests 400 --concurrency 50 --delay 0.2
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+from stub_numbers_api import StubNumbersApi
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def server_commands(port, workers):
+    return {
+        "sync": [sys.executable, "-m", "gunicorn", "--chdir", "api", "--workers", str(workers),
+                 "--bind", f"127.0.0.1:{port}", "--log-level", "warning", "classify_number:app"],
+        "async": [sys.executable, "-m", "uvicorn", "--app-dir", "api", "--workers", str(workers),
+                  "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning", "asgi:app"],
+    }
+
+async def wait_until_up(url, timeout=30):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                await client.get(url)
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.1)
+    raise RuntimeError(f"server at {url} did not start")
+
+async def run_load(base_url, numbers, concurrency, params=None):
+    # Requests /api/classify-number once per entry of `numbers` with
+    # `concurrency` requests in flight; returns (elapsed, sorted latencies).
+    latencies = []
+    numbers = iter(numbers)
+    limits = httpx.Limits(max_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        async def worker():
+            for n in numbers:
+                started = time.perf_counter()
+                response = await client.get("/api/classify-number", params={"number": n, **(params or {})})
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return elapsed, sorted(latencies)
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--delay", type=float, default=0.2, help="upstream delay in seconds")
+    parser.add_argument("--workers", type=int, default=2, help="server worker processes")
+    parser.add_argument("--modes", default="sync,async")
+    args = parser.parse_args()
+
+    with StubNumbersApi(delay=args.delay) as stub:
+        env = dict(os.environ, NUMBERS_API_URL=stub.url, FACT_LATENCY_BUDGET="5",
+                   UPSTREAM_POOL_SIZE=str(args.concurrency))
+        print(f"{args.requests} requests, concurrency {args.concurrency}, "
+              f"upstream delay {args.delay * 1000:.0f}ms, {args.workers} workers")
+        print(f"{'mode':<6} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+        for index, mode in enumerate(args.modes.split(",")):
+            port = free_port()
+            server = subprocess.Popen(server_commands(port, args.workers)[mode], cwd=ROOT, env=env)
+            try:
+                base_url = f"http://127.0.0.1:{port}"
+                asyncio.run(wait_until_up(base_url + "/"))
+                # Distinct numbers per mode so neither run hits a warm cache.
+                offset = 10 ** 6 * (index + 1)
+                elapsed, latencies = asyncio.run(
+                    run_load(base_url, range(offset, offset + args.requests), args.concurrency))
+            finally:
+                server.terminate()
+                server.wait()
+            print(f"{mode:<6} {len(latencies) / elapsed:8.1f} "
+                  f"{statistics.median(latencies) * 1000:8.1f} "
+                  f"{percentile(latencies, 0.95) * 1000:8.1f} "
+                  f"{percentile(latencies, 0.99) * 1000:8.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Local stand-in for numbersapi.com.
+
+Serves ``/<number>/math?json`` with a canned fact and counts the requests it
+receives, so the fact cache and load tests can run without network access.
+``delay`` adds latency to every response and ``failure_rate`` turns that
+fraction of responses into HTTP 500s; both can be changed while it runs.
+
+Run it standalone and point the API at it:
+
+    python benchmarks/stub_numbers_api.py --port 8001 --delay 0.2 --failure-rate 0.1
+    NUMBERS_API_URL=http://127.0.0.1:8001 python api/classify_number.py
+
+or embed it:
+
+    with StubNumbersApi() as stub:
+        os.environ["NUMBERS_API_URL"] = stub.url
+        ...
+        print(stub.request_count)
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class StubNumbersApi:
+    def __init__(self, host="127.0.0.1", port=0, delay=0.0, failure_rate=0.0, seed=None):
+        self.delay = delay
+        self.failure_rate = failure_rate
+        self.request_count = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def respond(self, number):
+        # Returns (status, payload) for one request; override to customise.
+        if self.delay:
+            time.sleep(self.delay)
+        with self._lock:
+            failed = self._random.random() < self.failure_rate
+        if failed:
+            return 500, {"error": "injected failure"}
+        return 200, {"text": f"{number} is a number served by the local stub.",
+                     "number": number, "found": True, "type": "math"}
+
+    def _count(self):
+        with self._lock:
+            self.request_count += 1
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                stub._count()
+                parts = self.path.split("?", 1)[0].strip("/").split("/")
+                if len(parts) != 2 or parts[1] != "math":
+                    status, payload = 404, {"error": "not found"}
+                else:
+                    status, payload = stub.respond(parts[0])
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--delay", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="fraction of responses that are HTTP 500")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    stub = StubNumbersApi(args.host, args.port, args.delay, args.failure_rate, args.seed)
+    print(f"Stub Numbers API listening on {stub.url}")
+    try:
+        stub.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
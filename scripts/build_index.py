@@ -0,0 +1,60 @@
+"""Build the precomputed property index and fun-fact snapshot.
+
+Writes api/data/property_index.bin, covering every number in [0, --limit]
+(prime bitset, perfect and Armstrong numbers, digit sums). It also writes
+api/data/facts.json with Numbers API facts for [0, --facts-limit). The API
+memory-maps the index and seeds its fact cache from the snapshot at
+startup; numbers outside the index are computed as before.
+
+    python scripts/build_index.py --limit 10000000 --facts-limit 1000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "api"))
+
+from config import DATA_DIR, NUMBERS_API_URL  # noqa: E402
+from property_index import PropertyIndex, build  # noqa: E402
+from upstream import NumbersApiClient  # noqa: E402
+
+def build_fact_snapshot(path, limit, index, workers):
+    # Armstrong numbers get a computed fact, so they are not fetched.
+    numbers = [n for n in range(limit) if not index.is_armstrong(n)]
+    client = NumbersApiClient(NUMBERS_API_URL, pool_size=workers)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        facts = dict(zip(numbers, executor.map(client.fetch_fact, numbers)))
+    snapshot = {str(n): text for n, text in facts.items() if text is not None}
+    with open(path, "w") as handle:
+        json.dump(snapshot, handle, separators=(",", ":"))
+    return len(snapshot), len(numbers)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--limit", type=int, default=10 ** 7, help="index covers 0..limit")
+    parser.add_argument("--facts-limit", type=int, default=1000, help="snapshot facts for 0..facts-limit - 1 (0 to skip)")
+    parser.add_argument("--output-dir", default=DATA_DIR)
+    parser.add_argument("--workers", type=int, default=16, help="concurrent fact fetches")
+    args = parser.parse_args()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    index_path = os.path.join(args.output_dir, "property_index.bin")
+
+    started = time.perf_counter()
+    build(index_path, args.limit)
+    index = PropertyIndex.open(index_path)
+    print(f"Wrote {index_path} ({os.path.getsize(index_path) / 1e6:.1f} MB, "
+          f"{len(index.perfect)} perfect, {len(index.armstrong)} Armstrong) "
+          f"in {time.perf_counter() - started:.1f}s")
+
+    if args.facts_limit > 0:
+        facts_path = os.path.join(args.output_dir, "facts.json")
+        started = time.perf_counter()
+        stored, requested = build_fact_snapshot(facts_path, args.facts_limit, index, args.workers)
+        print(f"Wrote {facts_path} ({stored} of {requested} facts) in {time.perf_counter() - started:.1f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+import os
+import sys
+
+import pytest
+
+# The API modules import each other as top-level modules (as Vercel runs
+# them), and the stub lives with the benchmarks.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [os.path.join(ROOT, "api"), os.path.join(ROOT, "benchmarks")]
+
+from stub_numbers_api import StubNumbersApi
+from upstream import NumbersApiClient
+
+class FakeClock:
+    # Stands in for time.monotonic; tests move time forward with advance().
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+@pytest.fixture
+def stub():
+    with StubNumbersApi() as stub:
+        yield stub
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+@pytest.fixture
+def client(stub):
+    client = NumbersApiClient(stub.url, timeout=2)
+    yield client
+    client.close()
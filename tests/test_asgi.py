@@ -0,0 +1,54 @@
+import pytest
+
+pytest.importorskip("starlette")
+pytest.importorskip("httpx")
+
+from starlette.testclient import TestClient
+
+import asgi
+from pipeline import DEFAULT_FIELDS
+
+SEMIPRIME_64 = 4294967291 * 4294967279
+# Large enough to leave the event loop, small enough to survive the float
+# parsing of ?number=.
+SEMIPRIME_52 = 67108837 * 67108859
+
+def test_cheap_requests_stay_on_the_event_loop():
+    assert not asgi.needs_process_pool([371], DEFAULT_FIELDS)
+    assert not asgi.needs_process_pool([SEMIPRIME_64], ("is_prime", "properties"))
+    assert not asgi.needs_process_pool(list(range(100)), ("prime_factors",))
+
+def test_expensive_requests_go_to_the_process_pool():
+    assert asgi.needs_process_pool([2 ** 64], ("is_prime",))
+    assert asgi.needs_process_pool(list(range(asgi.CPU_BATCH_SIZE)), ("parity",))
+    assert asgi.needs_process_pool([SEMIPRIME_64], ("prime_factors",))
+    assert asgi.needs_process_pool([10 ** 9 + 7] * 200, ("divisor_count",))
+
+@pytest.fixture
+def app_client(stub, monkeypatch):
+    monkeypatch.setattr(asgi, "NUMBERS_API_URL", stub.url)
+    with TestClient(asgi.app) as client:
+        yield client
+
+def test_factor_fields_are_computed_in_the_process_pool(app_client, monkeypatch):
+    offloaded = []
+    run_cpu = asgi.run_cpu
+
+    async def recording_run_cpu(func, *args):
+        offloaded.append(func.__name__)
+        return await run_cpu(func, *args)
+
+    monkeypatch.setattr(asgi, "run_cpu", recording_run_cpu)
+    response = app_client.get(f"/api/classify-number?number={SEMIPRIME_52}&fields=prime_factors")
+    assert response.json() == {"number": SEMIPRIME_52, "prime_factors": [67108837, 67108859]}
+    response = app_client.post("/api/classify-numbers?fields=divisor_count", json=[SEMIPRIME_64, 12])
+    assert [row["divisor_count"] for row in response.json()["results"]] == [4, 6]
+    assert offloaded == ["classify_deferring_fact", "classify_batch_deferring_facts"]
+
+def test_range_streams_never_fetch_facts(app_client, stub):
+    asgi.fact_cache.cache.put(10, "ten")
+    response = app_client.get("/api/classify-range?start=8&end=2000&fields=fun_fact")
+    facts = [line for line in response.text.splitlines()]
+    assert len(facts) == 1993
+    assert '"fun_fact":"ten"' in facts[2]
+    assert stub.request_count == 0
@@ -0,0 +1,119 @@
+import asyncio
+import time
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+from async_upstream import AsyncFactCache, AsyncNumbersApiClient
+from fact_cache import FactCache
+from upstream import CircuitBreaker
+
+def run(coro):
+    return asyncio.run(coro)
+
+class SlowFetch:
+    # Async fetch that records how many calls overlap.
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.calls = 0
+        self.running = 0
+        self.peak = 0
+
+    async def __call__(self, key):
+        self.calls += 1
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.running -= 1
+        return f"fact {key}"
+
+def test_fetches_are_bounded_by_concurrency_and_max_fetches():
+    fetch = SlowFetch(0.05)
+    cache = AsyncFactCache(FactCache(None), fetch, concurrency=4, max_pending=100)
+
+    async def scenario():
+        facts = await cache.get_many(range(1000), timeout=5, max_fetches=20)
+        return facts
+
+    facts = run(scenario())
+    assert sum(fact is not None for fact in facts.values()) == 20
+    assert fetch.calls == 20
+    assert fetch.peak == 4
+    assert cache.stats()["rejected"] == 980
+
+def test_budget_applies_once_to_the_whole_batch():
+    fetch = SlowFetch(0.2)
+    cache = AsyncFactCache(FactCache(None), fetch, concurrency=2, max_pending=100)
+
+    async def scenario():
+        started = time.monotonic()
+        facts = await cache.get_many(range(10), timeout=0.3)
+        elapsed = time.monotonic() - started
+        await asyncio.sleep(1.1)
+        return facts, elapsed
+
+    facts, elapsed = run(scenario())
+    assert elapsed < 0.45
+    # Two slots of 0.2 s each: only the first two fetches land within budget.
+    assert sum(fact is not None for fact in facts.values()) == 2
+    assert cache.stats()["timeouts"] == 8
+    # The rest kept going and filled the cache.
+    assert all(cache.cache.lookup(n)[1] == "fresh" for n in range(10))
+
+def test_pending_fetches_are_bounded():
+    fetch = SlowFetch(0.05)
+    cache = AsyncFactCache(FactCache(None), fetch, concurrency=1, max_pending=3)
+
+    async def scenario():
+        return await asyncio.gather(*(cache.get(n, timeout=5) for n in range(5)))
+
+    results = run(scenario())
+    assert results[:3] == ["fact 0", "fact 1", "fact 2"]
+    assert results[3:] == [None, None]
+    assert cache.stats()["rejected"] == 2
+
+def test_concurrent_misses_share_one_fetch():
+    fetch = SlowFetch(0.05)
+    cache = AsyncFactCache(FactCache(None), fetch)
+
+    async def scenario():
+        return await asyncio.gather(*(cache.get(7, timeout=5) for _ in range(10)))
+
+    assert run(scenario()) == ["fact 7"] * 10
+    assert fetch.calls == 1
+    assert cache.stats()["coalesced"] == 9
+
+def test_pool_timeouts_do_not_trip_the_breaker(stub):
+    stub.delay = 0.3
+    breaker = CircuitBreaker(failure_threshold=1)
+
+    async def scenario():
+        client = AsyncNumbersApiClient(stub.url, timeout=2, pool_size=1, breaker=breaker)
+        client.client = httpx.AsyncClient(
+            timeout=httpx.Timeout(2, pool=0.05), limits=httpx.Limits(max_connections=1))
+        try:
+            return await asyncio.gather(*(client.fetch_fact(n) for n in range(3))), client.stats()
+        finally:
+            await client.aclose()
+
+    facts, stats = run(scenario())
+    assert facts[0] == "0 is a number served by the local stub."
+    assert facts[1:] == [None, None]
+    assert stats["pool_timeouts"] == 2
+    assert stats["failures"] == 0
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert stub.request_count == 1
+
+def test_released_probe_can_be_retried(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+    clock.advance(10)
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.release()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow()
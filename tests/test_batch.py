@@ -0,0 +1,85 @@
+import random
+
+import numpy as np
+import pytest
+
+import batch
+from batch import BATCH_SIEVE_LIMIT, INT64_LIMIT, PERFECT_INT64, classify_batch, prime_kernel, sieve_array
+from pipeline import FIELDS, NO_FUN_FACT, classify
+
+FIELDS_TO_COMPARE = ("is_prime", "is_perfect", "is_armstrong", "parity", "digit_sum", "properties", "fun_fact")
+
+# The four 19-digit Armstrong numbers: their digit-power sums are where the
+# kernel's uint64 arithmetic can wrap around.
+ARMSTRONG_19 = [1517841543307505039, 3289582984443187032, 4498128791164624869, 4929273885928088826]
+
+def facts(numbers):
+    return {n: f"fact about {n}" for n in numbers}
+
+def assert_matches_scalar(numbers, fields=FIELDS_TO_COMPARE):
+    expected = [classify(n, fields, fetch_fact=lambda n: f"fact about {n}") for n in numbers]
+    assert classify_batch(numbers, fields, fact_lookup=facts) == expected
+
+def test_small_range():
+    assert_matches_scalar(list(range(-200, 10000)))
+
+def test_perfect_and_armstrong_numbers():
+    numbers = [int(n) for n in PERFECT_INT64] + ARMSTRONG_19 + [9474, 548834, 24678050, 912985153]
+    numbers += [n + d for n in numbers for d in (-1, 1)]
+    numbers += [-n for n in numbers]
+    assert_matches_scalar(numbers)
+
+def test_digit_power_sums_that_wrap_uint64():
+    # 19- and 20-digit numbers made of large digits overflow the uint64 sum.
+    rng = random.Random(6)
+    numbers = [int("".join(rng.choice("6789") for _ in range(19))) for _ in range(500)]
+    numbers += [10 ** 19 - 1, 9 * 10 ** 18 + 9, INT64_LIMIT - 1, -(INT64_LIMIT - 1)]
+    assert_matches_scalar(numbers, ("is_armstrong", "digit_sum", "properties"))
+
+def test_primes_around_the_batch_sieve_limit():
+    below = list(range(BATCH_SIEVE_LIMIT - 500, BATCH_SIEVE_LIMIT + 1))
+    assert_matches_scalar(below, ("is_prime",))
+    assert_matches_scalar(below + [BATCH_SIEVE_LIMIT + 19], ("is_prime",))
+    assert_matches_scalar(list(range(BATCH_SIEVE_LIMIT - 50, BATCH_SIEVE_LIMIT + 500)), ("is_prime",))
+
+def test_large_and_out_of_int64_values():
+    numbers = [INT64_LIMIT - 25, INT64_LIMIT - 1, INT64_LIMIT, INT64_LIMIT + 1, -INT64_LIMIT, -INT64_LIMIT - 1,
+               (1 << 64) - 59, (1 << 61) - 1, 2 ** 62 * (2 ** 63 - 1), 7, 8128]
+    assert_matches_scalar(numbers)
+
+def test_mixed_random_batch():
+    rng = random.Random(42)
+    numbers = [rng.randrange(-10 ** 6, 10 ** 6) for _ in range(300)]
+    numbers += [rng.randrange(-INT64_LIMIT, INT64_LIMIT) for _ in range(300)]
+    numbers += [rng.randrange(1 << 64) for _ in range(20)]
+    rng.shuffle(numbers)
+    assert_matches_scalar(numbers)
+
+def test_every_field_and_duplicates():
+    numbers = [371, 28, 371, -6, 0, 1, 2, 97, 97]
+    assert_matches_scalar(numbers, tuple(FIELDS))
+
+def test_facts_are_looked_up_once_per_distinct_non_armstrong_number():
+    calls = []
+
+    def lookup(numbers):
+        calls.append(numbers)
+        return {}
+
+    results = classify_batch([42, 371, 42, 43], ("fun_fact",), fact_lookup=lookup)
+    assert calls == [[42, 43]]
+    armstrong_fact = classify(371, ("fun_fact",))["fun_fact"]
+    assert [result["fun_fact"] for result in results] == [NO_FUN_FACT, armstrong_fact, NO_FUN_FACT, NO_FUN_FACT]
+    assert classify_batch([42], ("fun_fact",))[0]["fun_fact"] == NO_FUN_FACT
+
+def test_prime_kernel_reuses_its_sieve(monkeypatch):
+    expected = sieve_array(3 * 10 ** 6)
+    monkeypatch.setattr(batch, "_batch_sieve", None)
+    built = []
+    original = batch.odd_sieve_array
+    monkeypatch.setattr(batch, "odd_sieve_array", lambda limit: built.append(limit) or original(limit))
+    for top in (2 * 10 ** 6, 10 ** 6, 3 * 10 ** 6, 2 * 10 ** 6, 100):
+        values = np.arange(0, top + 1, dtype=np.int64)
+        assert (prime_kernel(values) == expected[:top + 1]).all(), top
+    # One table for 2*10^6, doubled once for 3*10^6; small batches use primality's table.
+    assert len(built) == 2
@@ -0,0 +1,136 @@
+import threading
+import time
+
+from fact_cache import FactCache
+
+def wait_for_idle(cache, timeout=5):
+    # Background refreshes run on the cache's executor; wait for them to land.
+    deadline = time.monotonic() + timeout
+    while cache.stats()["inflight"]:
+        assert time.monotonic() < deadline, "fetch did not finish"
+        time.sleep(0.01)
+
+def test_fresh_entries_are_served_from_cache(stub, client, clock):
+    cache = FactCache(client.fetch_fact, ttl=10, stale_ttl=0, clock=clock)
+    fact = cache.get(42)
+    assert fact == "42 is a number served by the local stub."
+    clock.advance(9.9)
+    assert cache.get(42) == fact
+    assert stub.request_count == 1
+    assert cache.stats()["hits"] == 1
+
+def test_entries_expire_after_ttl(stub, client, clock):
+    cache = FactCache(client.fetch_fact, ttl=10, stale_ttl=0, clock=clock)
+    cache.get(42)
+    clock.advance(10)
+    assert cache.lookup(42) == (None, "miss")
+    assert cache.get(42) is not None
+    assert stub.request_count == 2
+    assert cache.stats()["misses"] == 2
+
+def test_stale_entries_expire_after_stale_ttl(stub, client, clock):
+    cache = FactCache(client.fetch_fact, ttl=10, stale_ttl=20, clock=clock)
+    cache.put(42, "old fact")
+    clock.advance(30)
+    assert cache.get(42) == "42 is a number served by the local stub."
+    assert stub.request_count == 1
+    assert cache.stats()["stale_hits"] == 0
+
+def test_stale_entries_are_served_while_one_refresh_runs(stub, client, clock):
+    cache = FactCache(client.fetch_fact, ttl=10, stale_ttl=100, clock=clock)
+    cache.put(42, "old fact")
+    clock.advance(15)
+    stub.delay = 0.2
+    assert [cache.get(42, timeout=0.05) for _ in range(5)] == ["old fact"] * 5
+    wait_for_idle(cache)
+    assert stub.request_count == 1
+    stats = cache.stats()
+    assert stats["stale_hits"] == 5
+    assert stats["refreshes"] == 1
+    assert cache.lookup(42) == ("42 is a number served by the local stub.", "fresh")
+
+def test_least_recently_used_entry_is_evicted(stub, client, clock):
+    cache = FactCache(client.fetch_fact, maxsize=2, clock=clock)
+    cache.get(1)
+    cache.get(2)
+    cache.get(1)
+    cache.get(3)
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["size"] == 2
+    assert cache.lookup(2) == (None, "miss")
+    assert cache.lookup(1)[1] == "fresh"
+    assert cache.lookup(3)[1] == "fresh"
+    assert stub.request_count == 3
+
+def test_concurrent_misses_share_one_fetch(stub, client):
+    cache = FactCache(client.fetch_fact)
+    stub.delay = 0.2
+    callers = 10
+    barrier = threading.Barrier(callers)
+    results = []
+
+    def request():
+        barrier.wait()
+        results.append(cache.get(7, timeout=5))
+
+    threads = [threading.Thread(target=request) for _ in range(callers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["7 is a number served by the local stub."] * callers
+    assert stub.request_count == 1
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["coalesced"] == callers - 1
+
+def test_get_many_fetches_distinct_keys_once(stub, client):
+    cache = FactCache(client.fetch_fact)
+    facts = cache.get_many([1, 2, 1, 3], timeout=5)
+    assert sorted(facts) == [1, 2, 3]
+    assert all(facts.values())
+    assert stub.request_count == 3
+
+def test_failed_fetches_are_not_cached(stub, client):
+    cache = FactCache(client.fetch_fact)
+    stub.failure_rate = 1.0
+    assert cache.get(5) is None
+    assert cache.lookup(5) == (None, "miss")
+    assert cache.stats()["errors"] == 1
+    stub.failure_rate = 0.0
+    assert cache.get(5) == "5 is a number served by the local stub."
+    assert stub.request_count == 2
+
+def test_slow_fetch_times_out_and_fills_cache_later(stub, client):
+    cache = FactCache(client.fetch_fact)
+    stub.delay = 0.3
+    assert cache.get(9, timeout=0.05) is None
+    assert cache.stats()["timeouts"] == 1
+    wait_for_idle(cache)
+    assert cache.lookup(9)[1] == "fresh"
+    assert stub.request_count == 1
+
+def test_get_many_starts_at_most_max_fetches(stub, client):
+    cache = FactCache(client.fetch_fact)
+    cache.put(0, "cached fact")
+    facts = cache.get_many(range(20), timeout=5, max_fetches=3)
+    assert facts[0] == "cached fact"
+    assert [n for n, fact in facts.items() if fact] == [0, 1, 2, 3]
+    wait_for_idle(cache)
+    assert stub.request_count == 3
+    assert cache.stats()["rejected"] == 16
+
+def test_pending_fetches_are_bounded(stub, client):
+    cache = FactCache(client.fetch_fact, workers=1, max_pending=2)
+    stub.delay = 0.2
+    started = time.monotonic()
+    assert cache.get(1, timeout=0) is None
+    assert cache.get(2, timeout=0) is None
+    assert cache.get(3, timeout=5) is None
+    assert time.monotonic() - started < 0.1
+    assert cache.stats()["rejected"] == 1
+    # Coalescing onto a pending fetch is still allowed.
+    assert cache.get(1, timeout=5) == "1 is a number served by the local stub."
+    wait_for_idle(cache)
+    assert stub.request_count == 2
+    assert cache.get(3, timeout=5) is not None
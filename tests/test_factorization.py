@@ -0,0 +1,95 @@
+import math
+import random
+
+import pytest
+
+from factorization import (
+    TRIAL_DIVISION_LIMIT,
+    _pollard_rho,
+    divisor_count,
+    divisor_sum,
+    factorize,
+    is_perfect,
+    prime_factors,
+)
+from primality import is_prime
+
+# Every even perfect number below 2^63 (Mersenne exponents up to 31).
+PERFECT_INT64 = [(1 << (p - 1)) * ((1 << p) - 1) for p in (2, 3, 5, 7, 13, 17, 19, 31)]
+
+def brute_force_divisors(n):
+    return [d for d in range(1, n + 1) if n % d == 0]
+
+def test_small_numbers_match_brute_force():
+    for n in range(1, 2000):
+        divisors = brute_force_divisors(n)
+        assert divisor_count(n) == len(divisors), n
+        assert divisor_sum(n) == sum(divisors), n
+        assert math.prod(prime_factors(n)) == n
+        assert all(is_prime(p) for p in prime_factors(n))
+
+def test_zero_one_and_negative_numbers():
+    assert factorize(0) == ()
+    assert factorize(1) == ()
+    assert prime_factors(1) == []
+    assert divisor_count(0) == 0
+    assert divisor_sum(0) == 0
+    assert divisor_count(1) == 1
+    assert divisor_sum(1) == 1
+    assert factorize(-12) == factorize(12) == ((2, 2), (3, 1))
+    assert prime_factors(-30) == [2, 3, 5]
+    assert divisor_sum(-6) == 12
+
+@pytest.mark.parametrize("p, e", [(1009, 3), (65537, 4), ((1 << 31) - 1, 2), ((1 << 61) - 1, 2)])
+def test_prime_powers_above_the_trial_division_limit(p, e):
+    assert p > TRIAL_DIVISION_LIMIT
+    assert factorize(p ** e) == ((p, e),)
+    assert divisor_count(p ** e) == e + 1
+    assert divisor_sum(p ** e) == sum(p ** k for k in range(e + 1))
+
+@pytest.mark.parametrize("p, q", [
+    (4294967279, 4294967291),
+    (2147483647, 2305843009213693951),
+    (1000003, 999999000001),
+])
+def test_semiprimes(p, q):
+    assert factorize(p * q) == tuple(sorted(((p, 1), (q, 1))))
+    assert divisor_count(p * q) == 4
+    assert divisor_sum(p * q) == (1 + p) * (1 + q)
+
+def test_powers_of_composites():
+    p, q = 4294967279, 4294967291
+    assert factorize((p * q) ** 3) == ((p, 3), (q, 3))
+    assert factorize(((1 << 61) - 1) ** 2 * ((1 << 31) - 1) ** 5) == (((1 << 31) - 1, 5), ((1 << 61) - 1, 2))
+    assert factorize(1009 ** 12) == ((1009, 12),)
+
+def test_mixed_factorization():
+    n = 2 ** 5 * 3 ** 2 * 997 * 1009 ** 2 * 4294967291
+    assert factorize(n) == ((2, 5), (3, 2), (997, 1), (1009, 2), (4294967291, 1))
+    assert divisor_count(n) == 6 * 3 * 2 * 3 * 2
+
+def test_pollard_rho_finds_a_proper_factor():
+    random.seed(1)
+    for n in (1009 * 1013, 4294967279 * 4294967291, 10403):
+        d = _pollard_rho(n)
+        assert 1 < d < n and n % d == 0
+
+@pytest.mark.parametrize("n", PERFECT_INT64)
+def test_even_perfect_numbers(n):
+    assert is_perfect(n)
+    assert divisor_sum(n) == 2 * n
+
+@pytest.mark.parametrize("k", range(1, 40))
+def test_non_perfect_euclid_forms(k):
+    # 2^k * (2^(k+1) - 1) is perfect exactly when 2^(k+1) - 1 is prime.
+    n = (1 << k) * ((1 << (k + 1)) - 1)
+    assert is_perfect(n) == is_prime((1 << (k + 1)) - 1)
+    assert is_perfect(n) == (divisor_sum(n) == 2 * n)
+
+def test_is_perfect_matches_divisor_sum():
+    for n in range(-10, 10000):
+        assert is_perfect(n) == (n > 1 and divisor_sum(n) == 2 * n), n
+
+def test_odd_numbers_are_never_perfect():
+    assert not is_perfect(10 ** 1501 + 1)
+    assert not is_perfect(945)
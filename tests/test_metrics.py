@@ -0,0 +1,111 @@
+import re
+import time
+
+import pytest
+
+import metrics
+from metrics import Histogram, RequestTimer
+
+def series(text, name, **labels):
+    # Value of one sample in Prometheus text output, or None if absent.
+    label = ",".join(f'{key}="{value}"' for key, value in labels.items())
+    match = re.search(rf"^{re.escape(name)}{{{re.escape(label)}}} (\S+)$", text, re.MULTILINE)
+    return float(match.group(1)) if match else None
+
+@pytest.fixture(autouse=True)
+def fresh_histograms(monkeypatch):
+    monkeypatch.setattr(metrics, "STAGE_DURATION", Histogram(
+        metrics.STAGE_DURATION.name, metrics.STAGE_DURATION.help, metrics.STAGE_DURATION.labels))
+    monkeypatch.setattr(metrics, "REQUEST_DURATION", Histogram(
+        metrics.REQUEST_DURATION.name, metrics.REQUEST_DURATION.help, metrics.REQUEST_DURATION.labels))
+
+def test_histogram_render():
+    histogram = Histogram("test_seconds", "A test histogram.", ("route",), buckets=(0.1, 1.0))
+    histogram.observe(("a",), 0.05)
+    histogram.observe(("a",), 0.5)
+    histogram.observe(("a",), 5.0)
+    text = histogram.render()
+    assert text.startswith("# HELP test_seconds A test histogram.\n# TYPE test_seconds histogram\n")
+    assert series(text, "test_seconds_bucket", route="a", le="0.1") == 1
+    assert series(text, "test_seconds_bucket", route="a", le="1.0") == 2
+    assert series(text, "test_seconds_bucket", route="a", le="+Inf") == 3
+    assert series(text, "test_seconds_sum", route="a") == pytest.approx(5.55)
+    assert series(text, "test_seconds_count", route="a") == 3
+
+def test_nested_stages_are_charged_exclusively():
+    timer = RequestTimer("test")
+    with timer.stage("outer"):
+        time.sleep(0.02)
+        with timer.stage("inner"):
+            time.sleep(0.05)
+    assert 0.05 <= timer.stages["inner"] < 0.1
+    assert 0.02 <= timer.stages["outer"] < 0.05
+
+def test_finish_on_error_records_the_request():
+    timer = RequestTimer("test")
+    with pytest.raises(ValueError):
+        with timer.finish_on_error(), timer.stage("parse"):
+            raise ValueError("bad input")
+    text = metrics.render()
+    assert series(text, "classify_request_duration_seconds_count", route="test") == 1
+    assert series(text, "classify_stage_duration_seconds_count", route="test", stage="parse") == 1
+
+def test_server_timing_header_value():
+    timer = RequestTimer("test")
+    timer.stages = {"parse": 0.0012, "is_prime": 0.0000456}
+    assert timer.server_timing() == "parse;dur=1.200, is_prime;dur=0.046"
+
+def test_fact_cache_counters_are_rendered():
+    text = metrics.render({"hits": 3, "misses": 1, "breaker": {"state": "closed"}})
+    assert series(text, "fact_cache_events", event="hits") == 3
+    assert series(text, "fact_cache_events", event="misses") == 1
+    assert "breaker" not in text
+
+@pytest.fixture
+def flask_client(monkeypatch):
+    import classify_number
+    from fact_cache import FactCache
+
+    cache = FactCache(lambda n: f"fact {n}")
+    monkeypatch.setattr(classify_number, "fact_cache", cache)
+    return classify_number.app.test_client()
+
+def test_flask_metrics_endpoint(flask_client):
+    assert flask_client.get("/api/classify-number?number=42&fields=is_prime,fun_fact").status_code == 200
+    assert flask_client.get("/api/classify-number?number=abc").status_code == 400
+    assert flask_client.post("/api/classify-numbers", json=[1, 42, 43]).status_code == 200
+    response = flask_client.get("/metrics")
+    assert response.mimetype == "text/plain"
+    text = response.get_data(as_text=True)
+    assert series(text, "classify_request_duration_seconds_count", route="classify_number") == 2
+    for stage in ("parse", "is_prime", "fun_fact", "serialize"):
+        assert series(text, "classify_stage_duration_seconds_count", route="classify_number", stage=stage) >= 1
+    # The batch route reports fact fetching as its own stage, like the ASGI app.
+    for stage in ("parse", "classify_batch", "fun_fact", "serialize"):
+        assert series(text, "classify_stage_duration_seconds_count", route="classify_numbers", stage=stage) == 1
+    # 42 is fetched once and then hit; 1 is an Armstrong number.
+    assert series(text, "fact_cache_events", event="misses") == 2
+    assert series(text, "fact_cache_events", event="hits") == 1
+
+def test_flask_server_timing_header(flask_client, monkeypatch):
+    assert "Server-Timing" not in flask_client.get("/api/classify-number?number=42").headers
+    monkeypatch.setattr(metrics, "SERVER_TIMING", True)
+    header = flask_client.get("/api/classify-number?number=42&fields=is_prime,digit_sum").headers["Server-Timing"]
+    assert [entry.split(";")[0] for entry in header.split(", ")] == ["parse", "is_prime", "digit_sum", "serialize"]
+    assert all(re.fullmatch(r"\w+;dur=\d+\.\d{3}", entry) for entry in header.split(", "))
+
+def test_asgi_metrics_and_server_timing(stub, monkeypatch):
+    pytest.importorskip("starlette")
+    from starlette.testclient import TestClient
+
+    import asgi
+
+    monkeypatch.setattr(asgi, "NUMBERS_API_URL", stub.url)
+    monkeypatch.setattr(metrics, "SERVER_TIMING", True)
+    with TestClient(asgi.app) as client:
+        response = client.get("/api/classify-number?number=42&fields=is_prime,fun_fact")
+        assert "fun_fact;dur=" in response.headers["Server-Timing"]
+        assert client.get("/api/classify-number").status_code == 400
+        text = client.get("/metrics").text
+    assert series(text, "classify_request_duration_seconds_count", route="classify_number") == 2
+    assert series(text, "classify_stage_duration_seconds_count", route="classify_number", stage="fun_fact") == 1
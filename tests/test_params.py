@@ -0,0 +1,35 @@
+import pytest
+
+from config import MAX_BATCH_VALUE
+from params import InvalidRequest, batch_request, range_request, single_request
+
+def test_batch_accepts_numbers_within_the_cap():
+    numbers, fields = batch_request({}, [1, "2", 3.5, -MAX_BATCH_VALUE, MAX_BATCH_VALUE])
+    assert numbers == [1, 2, 3, -MAX_BATCH_VALUE, MAX_BATCH_VALUE]
+
+def test_batch_rejects_numbers_above_the_cap():
+    with pytest.raises(InvalidRequest) as excinfo:
+        batch_request({}, [1, MAX_BATCH_VALUE + 1])
+    assert "index 1" in excinfo.value.payload["message"]
+
+def test_batch_rejects_range_bounds_above_the_cap():
+    with pytest.raises(InvalidRequest):
+        batch_request({}, {"start": 10 ** 100, "end": 10 ** 100 + 5})
+
+def test_factor_fields_are_refused_for_large_semiprimes():
+    p, q = (1 << 89) - 1, (1 << 107) - 1
+    with pytest.raises(InvalidRequest):
+        single_request({"number": str(p * q), "fields": "prime_factors"})
+    with pytest.raises(InvalidRequest):
+        batch_request({"fields": "divisor_count"}, [MAX_BATCH_VALUE] * 200)
+
+def test_factor_limit_only_applies_to_factor_fields():
+    n, fields = single_request({"number": "1e30", "fields": "is_prime,is_perfect"})
+    assert n == int(1e30)
+    numbers, fields = batch_request({}, [MAX_BATCH_VALUE] * 200)
+    assert "prime_factors" not in fields
+
+def test_range_factor_limit_applies_per_number():
+    first, stop, next_cursor, fields = range_request(
+        {"start": "1", "end": "1000000", "limit": "10", "fields": "prime_factors"})
+    assert (first, stop, next_cursor) == (1, 10, "11")
@@ -0,0 +1,95 @@
+from collections import Counter
+
+import pytest
+
+import pipeline
+from params import InvalidRequest, single_request
+from pipeline import DEFAULT_FIELDS, FIELDS, NO_FUN_FACT, classify, parse_fields
+
+@pytest.fixture
+def calls(monkeypatch):
+    # Counts calls to every registered field function.
+    counter = Counter()
+
+    def counting(name, func):
+        def wrapper(profile):
+            counter[name] += 1
+            return func(profile)
+        return wrapper
+
+    for name, func in list(FIELDS.items()):
+        monkeypatch.setitem(FIELDS, name, counting(name, func))
+    return counter
+
+@pytest.fixture(params=[True, False], ids=["index", "no index"])
+def index(request, monkeypatch):
+    if not request.param:
+        monkeypatch.setattr(pipeline, "INDEX", None)
+    return request.param
+
+@pytest.mark.parametrize("n", [371, 28, 97, -153, 0, 10 ** 7 + 19, 2 ** 70])
+def test_every_field_is_computed_at_most_once(calls, index, n):
+    result = classify(n, tuple(FIELDS), fetch_fact=lambda m: "fact")
+    assert set(result) == {"number", *FIELDS}
+    assert max(calls.values()) == 1
+    assert set(calls) == set(FIELDS)
+
+def test_only_requested_fields_and_their_dependencies_are_computed(calls):
+    result = classify(10 ** 7 + 19, ("is_prime", "digit_sum"))
+    assert result == {"number": 10 ** 7 + 19, "is_prime": True, "digit_sum": 11}
+    assert set(calls) <= {"is_prime", "digit_sum", "digits"}
+    assert "fun_fact" not in calls and "prime_factors" not in calls
+
+def test_fun_fact_reuses_armstrong_check(calls):
+    fetched = []
+    result = classify(12345678, ("properties", "fun_fact"), fetch_fact=lambda m: fetched.append(m) or "fact")
+    assert result["fun_fact"] == "fact"
+    assert fetched == [12345678]
+    assert calls["is_armstrong"] == 1
+
+def test_armstrong_fun_fact_is_built_locally():
+    fetched = []
+    result = classify(371, ("fun_fact",), fetch_fact=fetched.append)
+    assert result["fun_fact"] == "371 is an Armstrong number because 3^3 + 7^3 + 1^3 = 371"
+    assert fetched == []
+
+def test_fun_fact_without_a_fetcher():
+    assert classify(42, ("fun_fact",))["fun_fact"] == NO_FUN_FACT
+
+def test_precomputed_values_are_not_recomputed(calls):
+    result = classify(97, ("is_prime", "parity"), values={"is_prime": "from batch"})
+    assert result["is_prime"] == "from batch"
+    assert "is_prime" not in calls
+
+def test_index_and_computation_agree(monkeypatch):
+    fields = ("is_prime", "is_perfect", "properties", "digit_sum")
+    numbers = [0, 1, 2, 28, 153, 496, 8128, 9474, 99991, 999983, -371]
+    indexed = [classify(n, fields) for n in numbers]
+    monkeypatch.setattr(pipeline, "INDEX", None)
+    assert indexed == [classify(n, fields) for n in numbers]
+
+def test_parse_fields():
+    assert parse_fields(None) == DEFAULT_FIELDS
+    assert parse_fields("  ") == DEFAULT_FIELDS
+    assert parse_fields("digit_sum, is_prime,digit_sum") == ("digit_sum", "is_prime")
+    assert parse_fields("number,is_prime") == ("is_prime",)
+    assert parse_fields("number") == ()
+
+def test_unknown_fields_are_rejected():
+    with pytest.raises(ValueError, match="Unknown field\\(s\\): foo, bar"):
+        parse_fields("is_prime,foo,bar")
+    with pytest.raises(InvalidRequest) as excinfo:
+        single_request({"number": "7", "fields": "is_prime,nope"})
+    assert excinfo.value.payload == {"number": "7", "error": True, "message": "Unknown field(s): nope"}
+
+def test_field_subsets_over_http():
+    import classify_number
+
+    client = classify_number.app.test_client()
+    response = client.get("/api/classify-number?number=371&fields=number,is_prime,digit_sum")
+    assert response.status_code == 200
+    assert response.get_json() == {"number": 371, "is_prime": False, "digit_sum": 11}
+    assert client.get("/api/classify-number?number=371&fields=number").get_json() == {"number": 371}
+    response = client.get("/api/classify-number?number=371&fields=is_prime,bogus")
+    assert response.status_code == 400
+    assert response.get_json()["message"] == "Unknown field(s): bogus"
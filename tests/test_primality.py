@@ -0,0 +1,83 @@
+import math
+
+import pytest
+
+import primality
+from primality import (
+    MR_BASES_64,
+    _is_strong_lucas_probable_prime,
+    _is_strong_probable_prime,
+    _jacobi,
+    is_prime,
+)
+
+LIMIT = 10 ** 5
+
+def trial_division(n):
+    return n >= 2 and all(n % d for d in range(2, math.isqrt(n) + 1))
+
+EXPECTED = [trial_division(n) for n in range(LIMIT + 1)]
+
+def test_sieve_matches_trial_division():
+    assert [is_prime(n) for n in range(LIMIT + 1)] == EXPECTED
+
+def test_miller_rabin_path_matches_trial_division(monkeypatch):
+    # With the sieve disabled every number goes through small-prime
+    # division and deterministic Miller-Rabin.
+    monkeypatch.setattr(primality, "SIEVE_LIMIT", 0)
+    assert [is_prime(n) for n in range(LIMIT + 1)] == EXPECTED
+
+def test_baillie_psw_matches_trial_division():
+    for n in range(101, LIMIT + 1, 2):
+        bpsw = _is_strong_probable_prime(n, 2) and _is_strong_lucas_probable_prime(n)
+        assert bpsw == EXPECTED[n], n
+
+def test_numbers_just_above_the_sieve_limit():
+    start = primality.SIEVE_LIMIT - 1000
+    for n in range(start, start + 3000):
+        assert is_prime(n) == trial_division(n), n
+
+def test_negative_numbers_zero_and_one_are_not_prime():
+    assert not any(is_prime(n) for n in (-7, -2, -1, 0, 1))
+
+@pytest.mark.parametrize("n", [3215031751, 3825123056546413051])
+def test_strong_base_2_pseudoprimes_are_composite(n):
+    assert _is_strong_probable_prime(n, 2)
+    assert not is_prime(n)
+
+@pytest.mark.parametrize("n", [5459, 5777, 10877, 16109, 18971])
+def test_strong_lucas_pseudoprimes(n):
+    assert _is_strong_lucas_probable_prime(n)
+    assert not trial_division(n)
+    assert not _is_strong_probable_prime(n, 2)
+
+@pytest.mark.parametrize("p", [61, 89, 107, 127, 521, 607, 1279])
+def test_mersenne_primes(p):
+    assert is_prime((1 << p) - 1)
+
+@pytest.mark.parametrize("n", [
+    (1 << 67) - 1,  # 193707721 * 761838257287
+    (1 << 64) + 1,  # 274177 * 67280421310721
+    ((1 << 61) - 1) * ((1 << 89) - 1),
+    ((1 << 89) - 1) ** 2,
+    ((1 << 127) - 1) * 1000003,
+    ((1 << 89) - 1) * ((1 << 107) - 1),
+])
+def test_composites_above_64_bits(n):
+    assert not is_prime(n)
+
+def test_largest_prime_below_2_to_64():
+    assert is_prime((1 << 64) - 59)
+    assert not any(is_prime(n) for n in range((1 << 64) - 58, 1 << 64))
+
+def test_deterministic_bases_cover_known_pseudoprimes():
+    # 3825123056546413051 passes bases up to 23 but not all of MR_BASES_64.
+    n = 3825123056546413051
+    assert all(_is_strong_probable_prime(n, a) for a in MR_BASES_64[:9])
+    assert not all(_is_strong_probable_prime(n, a) for a in MR_BASES_64)
+
+def test_jacobi_symbol_matches_euler_criterion():
+    for p in (n for n in range(3, 200) if EXPECTED[n]):
+        for a in range(-50, 50):
+            euler = pow(a, (p - 1) // 2, p)
+            assert _jacobi(a, p) == (0 if a % p == 0 else 1 if euler == 1 else -1), (a, p)
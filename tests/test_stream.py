@@ -0,0 +1,108 @@
+import json
+
+import pytest
+
+from batch import segmented_sieve
+from fact_cache import FactCache
+from params import InvalidRequest, range_request
+from pipeline import NO_FUN_FACT, classify
+from primality import is_prime
+from stream import chunked, classify_range
+
+FIELDS = ("is_prime", "is_perfect", "properties", "digit_sum", "fun_fact")
+
+@pytest.mark.parametrize("start, end, segment_size", [
+    (0, 1000, 97),
+    (-50, 300, 64),
+    (-10, -1, 4),
+    (2, 2, 1),
+    (1, 1024, 128),
+    (999_900, 1_000_300, 100),
+    (10 ** 12 - 500, 10 ** 12, 77),
+])
+def test_segmented_sieve_matches_is_prime(start, end, segment_size):
+    values, flags = [], []
+    for segment_values, segment_flags in segmented_sieve(start, end, segment_size):
+        assert 0 < len(segment_values) <= segment_size
+        values.extend(segment_values.tolist())
+        flags.extend(segment_flags.tolist())
+    assert values == list(range(start, end + 1))
+    assert flags == [is_prime(n) for n in values]
+
+def test_classify_range_matches_classify_across_segments():
+    facts = lambda numbers: {n: f"fact {n}" for n in numbers}
+    results = list(classify_range(-40, 700, FIELDS, fact_lookup=facts, segment_size=50))
+    assert results == [classify(n, FIELDS, fetch_fact=lambda n: f"fact {n}") for n in range(-40, 701)]
+
+def test_chunked():
+    assert [len(chunk) for chunk in chunked(range(1100), 512)] == [512, 512, 76]
+    assert list(chunked([], 512)) == []
+
+def args(**params):
+    return {name: str(value) for name, value in params.items()}
+
+def test_range_request_paging():
+    assert range_request(args(start=1, end=2500, limit=1000))[:3] == (1, 1000, "1001")
+    assert range_request(args(start=1, end=2500, limit=1000, cursor=2001))[:3] == (2001, 2500, "")
+    assert range_request(args(start=1, end=2500))[:3] == (1, 2500, "")
+    assert range_request(args(start=-5, end=5, limit=3, cursor=-2))[:3] == (-2, 0, "1")
+
+def test_cursor_past_the_end_yields_nothing():
+    first, stop, next_cursor, fields = range_request(args(start=1, end=10, cursor=11))
+    assert (first, stop, next_cursor) == (11, 10, "")
+    assert list(classify_range(first, stop, fields)) == []
+
+@pytest.mark.parametrize("params", [
+    args(start=10, end=1),
+    args(start=1, end=10, cursor=0),
+    args(start=1, end=10, cursor=12),
+    args(start=1, end=10, limit=-1),
+    args(start=1, end=10 ** 13),
+    args(end=10),
+    args(start="x", end=10),
+])
+def test_invalid_ranges(params):
+    with pytest.raises(InvalidRequest):
+        range_request(params)
+
+def test_facts_false_drops_the_field():
+    assert "fun_fact" not in range_request(args(start=1, end=2, facts="false"))[3]
+
+@pytest.fixture
+def flask_client(monkeypatch):
+    import classify_number
+
+    def fetch(n):
+        raise AssertionError("streams must not fetch facts")
+
+    cache = FactCache(fetch)
+    cache.put(10, "ten")
+    monkeypatch.setattr(classify_number, "fact_cache", cache)
+    return classify_number.app.test_client()
+
+def read_lines(response):
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+def test_x_next_cursor_pages_through_the_range(flask_client):
+    numbers = []
+    url = "/api/classify-range?start=-5&end=2500&limit=1000&fields=is_prime"
+    cursor = None
+    while True:
+        response = flask_client.get(url + (f"&cursor={cursor}" if cursor else ""))
+        assert response.status_code == 200
+        assert response.mimetype == "application/x-ndjson"
+        numbers.extend(line["number"] for line in read_lines(response))
+        cursor = response.headers["X-Next-Cursor"]
+        if not cursor:
+            break
+    assert numbers == list(range(-5, 2501))
+
+def test_streams_use_cached_facts_only(flask_client):
+    lines = read_lines(flask_client.get("/api/classify-range?start=8&end=12&fields=fun_fact"))
+    assert [line["fun_fact"] for line in lines] == [
+        "8 is an Armstrong number because 8^1 = 8",
+        "9 is an Armstrong number because 9^1 = 9",
+        "ten",
+        NO_FUN_FACT,
+        NO_FUN_FACT,
+    ]
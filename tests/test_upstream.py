@@ -0,0 +1,141 @@
+import time
+
+import pytest
+
+from fact_cache import FactCache
+from pipeline import NO_FUN_FACT
+from upstream import CircuitBreaker, NumbersApiClient
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker(failure_threshold=3, reset_timeout=30, clock=clock)
+
+@pytest.fixture
+def guarded_client(stub, breaker):
+    client = NumbersApiClient(stub.url, timeout=2, breaker=breaker)
+    yield client
+    client.close()
+
+def test_breaker_opens_after_consecutive_failures(stub, guarded_client, breaker):
+    stub.failure_rate = 1.0
+    for _ in range(2):
+        assert guarded_client.fetch_fact(1) is None
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert guarded_client.fetch_fact(1) is None
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.stats()["times_opened"] == 1
+    assert stub.request_count == 3
+
+def test_success_resets_the_failure_count(stub, guarded_client, breaker):
+    stub.failure_rate = 1.0
+    guarded_client.fetch_fact(1)
+    guarded_client.fetch_fact(1)
+    stub.failure_rate = 0.0
+    assert guarded_client.fetch_fact(1) is not None
+    assert breaker.stats()["consecutive_failures"] == 0
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_open_breaker_short_circuits_without_calling_upstream(stub, guarded_client, breaker, clock):
+    stub.failure_rate = 1.0
+    for _ in range(3):
+        guarded_client.fetch_fact(1)
+    stub.failure_rate = 0.0
+    clock.advance(29)
+    for _ in range(4):
+        assert guarded_client.fetch_fact(1) is None
+    assert stub.request_count == 3
+    stats = guarded_client.stats()
+    assert stats["short_circuited"] == 4
+    assert stats["requests"] == 3
+    assert stats["failures"] == 3
+    assert stats["breaker"]["retry_in"] == pytest.approx(1)
+
+def test_short_circuit_does_not_create_a_session(breaker):
+    for _ in range(3):
+        breaker.record_failure()
+    client = NumbersApiClient("http://127.0.0.1:9", breaker=breaker)
+    assert client.fetch_fact(1) is None
+    assert client._session is None
+    assert client.stats()["short_circuited"] == 1
+
+def test_half_open_breaker_lets_one_probe_through(stub, guarded_client, breaker, clock):
+    stub.failure_rate = 1.0
+    for _ in range(3):
+        guarded_client.fetch_fact(1)
+    stub.failure_rate = 0.0
+    clock.advance(30)
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    # The probe above is still outstanding, so other calls are rejected.
+    assert guarded_client.fetch_fact(1) is None
+    assert guarded_client.stats()["short_circuited"] == 1
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert guarded_client.fetch_fact(1) is not None
+    assert stub.request_count == 4
+
+def test_probe_through_the_client_closes_the_breaker(stub, guarded_client, breaker, clock):
+    stub.failure_rate = 1.0
+    for _ in range(3):
+        guarded_client.fetch_fact(1)
+    stub.failure_rate = 0.0
+    clock.advance(30)
+    assert guarded_client.fetch_fact(1) == "1 is a number served by the local stub."
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert stub.request_count == 4
+
+def test_failed_probe_reopens_the_breaker(stub, guarded_client, breaker, clock):
+    stub.failure_rate = 1.0
+    for _ in range(3):
+        guarded_client.fetch_fact(1)
+    clock.advance(30)
+    assert guarded_client.fetch_fact(1) is None
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.stats()["times_opened"] == 2
+    assert stub.request_count == 4
+    # The reset timeout starts over from the failed probe.
+    clock.advance(29)
+    assert guarded_client.fetch_fact(1) is None
+    assert stub.request_count == 4
+    clock.advance(1)
+    stub.failure_rate = 0.0
+    assert guarded_client.fetch_fact(1) is not None
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_upstream_timeout_counts_as_failure(stub):
+    stub.delay = 0.5
+    breaker = CircuitBreaker(failure_threshold=1)
+    client = NumbersApiClient(stub.url, timeout=0.1, breaker=breaker)
+    try:
+        assert client.fetch_fact(1) is None
+        assert breaker.state == CircuitBreaker.OPEN
+    finally:
+        client.close()
+
+def test_get_fun_fact_returns_within_latency_budget(stub, client, monkeypatch):
+    import classify_number
+
+    monkeypatch.setattr(classify_number, "fact_cache", FactCache(client.fetch_fact))
+    stub.delay = 1.0
+    started = time.monotonic()
+    assert classify_number.get_fun_fact(17) == NO_FUN_FACT
+    elapsed = time.monotonic() - started
+    assert elapsed < classify_number.FACT_LATENCY_BUDGET + 0.2
+
+    # The slow fetch keeps going in the background and fills the cache.
+    time.sleep(1.2)
+    assert classify_number.get_fun_fact(17) == "17 is a number served by the local stub."
+    assert stub.request_count == 1
+
+def test_classify_number_responds_within_latency_budget(stub, client, monkeypatch):
+    import classify_number
+
+    monkeypatch.setattr(classify_number, "fact_cache", FactCache(client.fetch_fact))
+    stub.delay = 1.0
+    started = time.monotonic()
+    response = classify_number.app.test_client().get("/api/classify-number?number=17")
+    elapsed = time.monotonic() - started
+    assert response.status_code == 200
+    assert response.get_json()["fun_fact"] == NO_FUN_FACT
+    assert response.get_json()["is_prime"] is True
+    assert elapsed < classify_number.FACT_LATENCY_BUDGET + 0.2